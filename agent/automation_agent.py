@@ -1,13 +1,24 @@
 import os
 import json
+import asyncio
 from pathlib import Path
+from typing import Optional
 
-import requests
 from openai import OpenAI
 from agent.behavior_explorer import BehaviorExplorer
+from agent.cassette import CassetteTransport
+from agent.http_transport import (
+    DEFAULT_MAX_BODY_BYTES,
+    HttpTransport,
+    configure_transport,
+    get_transport,
+)
+from agent.rate_control import AIMDRateController
 from agent.intent_model_builder import IntentModelBuilder
 from agent.swagger_reader import read_swagger, extract_endpoints
 from agent.test_generator import generate_tests
+from resolution.resolution_cache import ResolutionCache
+from resolution.instrumentation import StageProfiler
 
 client = OpenAI()
 
@@ -180,12 +191,17 @@ def ensure_fixtures():
         """
 import os
 import pytest
-import requests
+
+from agent.http_transport import get_transport
+# Collects the cases of *.manifest.json / *.manifest.msgpack files
+from automation.manifest_plugin import pytest_collect_file  # noqa: F401
+# Runs create cases of every module first (lifecycle chaining)
+from automation.lifecycle_order import pytest_collection_modifyitems  # noqa: F401
 
 BASE_URL = os.getenv("BASE_URL")
 
 def login(username: str, password: str) -> str:
-    response = requests.post(
+    response = get_transport().post(
         f"{BASE_URL}/api/v1/auth/auth/login",
         data={
             "grant_type": os.getenv("GRANT_TYPE", "password"),
@@ -243,49 +259,77 @@ def run_agent(spec: dict):
     if not swagger_url:
         raise ValueError("swagger_url is required for API test generation")
 
-    # ----------------------------
-    #  Read Swagger
-    # ----------------------------
-    print("Reading Swagger...")
-    swagger_spec = read_swagger(swagger_url)
-    swagger_base_url, endpoints = extract_endpoints(swagger_spec)
+    # Shared keep-alive transport for every outbound call
+    transport = configure_transport(**spec.get("http_pool", {}))
+
+    # Record / replay every exchange through a cassette
+    cassette = spec.get("cassette")
+    if cassette:
+        transport = CassetteTransport(
+            cassette["path"],
+            mode=cassette.get("mode", "replay"),
+            inner=transport,
+            max_body_bytes=spec.get("explorer", {}).get(
+                "max_body_bytes", DEFAULT_MAX_BODY_BYTES
+            ),
+        )
 
-    base_url = swagger_base_url or base_url
+    # Everything up to the end of exploration goes through the cassette;
+    # it is closed (flushed) even when a step fails
+    try:
+        # ----------------------------
+        #  Read Swagger
+        # ----------------------------
+        print("Reading Swagger...")
+        swagger_spec = read_swagger(swagger_url, transport=transport)
+        swagger_base_url, endpoints = extract_endpoints(swagger_spec)
 
-    print(f"Discovered {len(endpoints)} endpoints")
+        base_url = swagger_base_url or base_url
 
-    # ----------------------------
-    # Role Authentication
-    # ----------------------------
-    print("Authenticating roles...")
+        print(f"Discovered {len(endpoints)} endpoints")
 
-    role_headers = {}
-    for role_name, credentials in spec.get("roles", {}).items():
+        # ----------------------------
+        # Role Authentication
+        # ----------------------------
+        print("Authenticating roles...")
+
+        role_headers = {}
+        for role_name, credentials in spec.get("roles", {}).items():
         
-        headers = authenticate_role(
-            base_url,
-            spec["auth"],
-            credentials
+            headers = authenticate_role(
+                base_url,
+                spec["auth"],
+                credentials,
+                transport=transport,
+            )
+            role_headers[role_name] = headers
+
+        print(f"Authenticated roles: {list(role_headers.keys())}")
+
+        # ----------------------------
+        # Behavior Explorer
+        # ----------------------------
+        print("Running Behavior Explorer...")
+
+        explorer = BehaviorExplorer(
+            base_url=base_url,
+            endpoints=endpoints,
+            role_headers=role_headers,   # <-- multi-role support
+            environment=environment,
+            rate_controller=AIMDRateController(**spec.get("rate_control", {})),
+            transport=transport,
+            **spec.get("explorer", {}),
         )
-        role_headers[role_name] = headers
-
-    print(f"Authenticated roles: {list(role_headers.keys())}")
 
-   # ----------------------------
-    # Behavior Explorer
-    # ----------------------------
-    print("Running Behavior Explorer...")
-
-    explorer = BehaviorExplorer(
-        base_url=base_url,
-        endpoints=endpoints,
-        role_headers=role_headers,   # <-- multi-role support
-        environment=environment,
-    )
-
-    behavior_report = explorer.explore_all()
+        if spec.get("concurrent_exploration", True):
+            behavior_report = asyncio.run(explorer.explore_all_async())
+        else:
+            behavior_report = explorer.explore_all()
 
-    print(f"Behavior analysis completed for {len(behavior_report)} endpoints")
+        print(f"Behavior analysis completed for {len(behavior_report)} endpoints")
+    finally:
+        if cassette:
+            transport.close()
 
 
     # ----------------------------
@@ -303,7 +347,34 @@ def run_agent(spec: dict):
     # Generate Tests
     # ----------------------------
     if spec.get("generate_api_tests", True):
-        generate_tests(base_url, intent_model, swagger_spec)
+        resolution_cache = None
+        if spec.get("resolution_cache"):
+            resolution_cache = ResolutionCache(**spec["resolution_cache"])
+
+        profiler = None
+        if spec.get("profile_resolution"):
+            profiler = StageProfiler(**spec.get("profile_options", {}))
+
+        try:
+            generate_tests(
+                base_url,
+                intent_model,
+                swagger_spec,
+                resolution_cache=resolution_cache,
+                observers=[profiler] if profiler else None,
+                shard_by=spec.get("shard_by", "tag"),
+                emit_style=spec.get("emit_style", "functions"),
+                manifest_format=spec.get("manifest_format", "json"),
+                incremental=spec.get("incremental_generation", True),
+                hash_mode=spec.get("hash_mode", "compat"),
+            )
+        finally:
+            if resolution_cache is not None:
+                resolution_cache.close()
+
+        if profiler:
+            profiler.print_summary()
+            profiler.close()
 
     if not spec.get("enable_ui_tests", False):
         print("UI tests are disabled (code retained, not executed)")
@@ -336,11 +407,17 @@ def strip_markdown_fences(code: str) -> str:
     return code.strip()
 
 
-def authenticate_role(base_url: str, auth_config: dict, credentials: dict) -> dict:
+def authenticate_role(
+    base_url: str,
+    auth_config: dict,
+    credentials: dict,
+    transport: Optional[HttpTransport] = None,
+) -> dict:
     """
     Authenticates a role using OAuth2 password flow.
     Returns headers with Bearer token.
     """
+    transport = transport or get_transport()
 
     login_url = f"{base_url.rstrip('/')}{auth_config['login_path']}"
 
@@ -353,7 +430,7 @@ def authenticate_role(base_url: str, auth_config: dict, credentials: dict) -> di
         "client_secret": auth_config.get("client_secret", ""),
     }
 
-    response = requests.post(
+    response = transport.post(
         login_url,
         data=form_data,
         headers={
@@ -401,12 +478,58 @@ if __name__ == "__main__":
                         "client_id": "string",
                         "client_secret": ""
                     },
+        # Connection pools shared by explorer, auth and swagger reads
+        "http_pool": {
+            "pool_connections": 10,
+            "pool_maxsize": 20,
+        },
+        # Explore endpoints concurrently (BehaviorExplorer options below)
+        "concurrent_exploration": True,
+        "explorer": {
+            "max_concurrency": 8,
+            "per_host_limit": 4,
+            # Stream each endpoint to disk; resume=True skips finished ones
+            "checkpoint_path": "behavior_checkpoint.jsonl",
+            "resume": False,
+            # Reuse behavior of unchanged operations (TTL in seconds)
+            "behavior_cache_path": ".agent_cache/behavior_cache.json",
+            "behavior_cache_ttl": 7 * 24 * 3600,
+        },
+        # Adaptive (AIMD) throttling of exploration traffic
+        "rate_control": {
+            "initial_limit": 2,
+            "max_limit": 16,
+        },
+        # Record / replay HTTP exchanges (mode: "record" | "replay")
+        # "cassette": {"path": "cassettes/staging", "mode": "replay"},
         # Keep UI code in repo, but do not run it
         "enable_ui_tests": False,
         # API test generation options
         "generate_api_tests": True,
         # Overwrite previously generated API tests
         "overwrite": True,
+        # One test module per OpenAPI tag ("tag"), per resource ("resource")
+        # or a single test_generated_api.py (None)
+        "shard_by": "tag",
+        # "functions" (one test function per case), "table" (case tables
+        # run by one parametrized test) or "manifest" (no Python: case
+        # manifests collected by automation/manifest_plugin.py)
+        "emit_style": "functions",
+        # Manifest encoding: "json" or "msgpack" (optional dependency)
+        "manifest_format": "json",
+        # Rewrite only generated files whose operations / intent changed
+        "incremental_generation": True,
+        # Payload value hash: "compat" (historical values) or "fast"
+        # (cheaper, different values)
+        "hash_mode": "compat",
+        # Reuse resolved test data of unchanged operations between runs
+        "resolution_cache": {
+            "path": ".agent_cache/resolutions.sqlite",
+            "max_bytes": 64 * 1024 * 1024,
+        },
+        # Print per-stage / per-endpoint resolution timings
+        "profile_resolution": False,
+        # "profile_options": {"trace_allocations": True},
     }
 
 
@@ -0,0 +1,102 @@
+"""
+Behavior Cache
+--------------
+Reuses behavior from previous runs for operations whose
+spec fingerprint has not changed.
+
+An entry is reused when:
+- the operation fingerprint matches
+- the entry is younger than the TTL (if one is set)
+- the run context (base URL, environment, roles) is the same
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+
+def run_context(base_url: str, environment: str, roles: Iterable[str]) -> str:
+    canonical = json.dumps(
+        {"base_url": base_url, "environment": environment, "roles": sorted(roles)}
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class BehaviorCache:
+    def __init__(self, path: str, context: str, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.context = context
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: Dict[str, dict] = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("context") == context:
+                self._entries = stored.get("entries", {})
+
+    # --------------------------------------------------
+    # Lookup / Store
+    # --------------------------------------------------
+    def lookup(self, key: str, fingerprint: Optional[str]):
+        """
+        Returns (hit, behavior). A miss means the operation is new,
+        changed, or its entry has expired.
+        """
+        with self._lock:
+            self._seen.add(key)
+            entry = self._entries.get(key)
+
+            if not entry or not fingerprint or entry["fingerprint"] != fingerprint:
+                return False, None
+
+            if self.ttl_seconds is not None:
+                if time.time() - entry["explored_at"] > self.ttl_seconds:
+                    return False, None
+
+            self.hits += 1
+            return True, entry["behavior"]
+
+    def store(self, key: str, fingerprint: Optional[str], behavior: Optional[dict]):
+        if not fingerprint:
+            return
+
+        with self._lock:
+            self._seen.add(key)
+            self._entries[key] = {
+                "fingerprint": fingerprint,
+                "explored_at": time.time(),
+                "behavior": behavior,
+            }
+
+    def keep(self, key: str):
+        """
+        Keeps the entry of an operation that was not looked up this run
+        (e.g. already in the resume checkpoint).
+        """
+        with self._lock:
+            self._seen.add(key)
+
+    # --------------------------------------------------
+    # Persistence
+    # --------------------------------------------------
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            # Operations removed from the spec are dropped
+            entries = {k: v for k, v in self._entries.items() if k in self._seen}
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"context": self.context, "entries": entries}, f, default=str)
+        os.replace(tmp_path, self.path)
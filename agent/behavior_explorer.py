@@ -1,5 +1,36 @@
-import requests
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from agent.behavior_cache import BehaviorCache, run_context
+from agent.checkpoint import BehaviorCheckpoint, endpoint_key
+from agent.http_transport import (
+    DEFAULT_MAX_BODY_BYTES,
+    HttpTransport,
+    get_transport,
+    read_capped,
+    take_connect_time,
+)
+from agent.latency_profile import LatencyRecorder
+from agent.schema_inference import DEFAULT_MAX_ITEMS, build_schema, infer_schema
+from agent.rate_control import AIMDRateController, RateController, should_retry
+from agent.response_cache import (
+    MEMOIZABLE_METHODS,
+    ETagStore,
+    RunMemo,
+    header_identity,
+    request_fingerprint,
+)
+
+# Query parameter names that declare a capability in the spec
+CAPABILITY_PARAMS = {
+    "pagination": {"page", "limit", "offset", "skip", "per_page", "page_size", "size", "cursor"},
+    "sorting": {"sort", "sort_by", "order", "order_by", "ordering"},
+    "filtering": {"filter", "filters", "q", "query", "search"},
+}
 
 
 class BehaviorExplorer:
@@ -9,23 +40,145 @@ class BehaviorExplorer:
         endpoints: List[dict],
         role_headers: Optional[Dict[str, Dict]] = None,
         environment: str = "staging",
+        max_concurrency: int = 8,
+        per_host_limit: int = 4,
+        transport: Optional[HttpTransport] = None,
+        memoize: bool = True,
+        etag_cache_path: Optional[str] = None,
+        rate_controller: Optional[RateController] = None,
+        max_retries: int = 2,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        schema_sample_size: int = DEFAULT_MAX_ITEMS,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = False,
+        behavior_cache_path: Optional[str] = None,
+        behavior_cache_ttl: Optional[float] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.endpoints = endpoints
         self.role_headers = role_headers or {}
         self.environment = environment
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.transport = transport or get_transport()
+        self.memoize = memoize
+        self.etag_store = ETagStore(etag_cache_path) if etag_cache_path else None
+        self.rate_controller = rate_controller or AIMDRateController(
+            max_limit=self.max_concurrency * self.per_host_limit
+        )
+        self.max_retries = max_retries
+        self.max_body_bytes = max_body_bytes
+        self.schema_sample_size = schema_sample_size
+        self.checkpoint = (
+            BehaviorCheckpoint(checkpoint_path, resume=resume)
+            if checkpoint_path
+            else None
+        )
+        self.behavior_cache = (
+            BehaviorCache(
+                behavior_cache_path,
+                context=run_context(self.base_url, environment, self.role_headers),
+                ttl_seconds=behavior_cache_ttl,
+            )
+            if behavior_cache_path
+            else None
+        )
         self.report = []
 
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_limits_lock = threading.Lock()
+        self._memo = RunMemo()
+        self._latency = LatencyRecorder()
+
     # --------------------------------------------------
     # Entry Point
     # --------------------------------------------------
     def explore_all(self) -> List[dict]:
+        self._start_run()
         for ep in self.endpoints:
-            result = self.explore_endpoint(ep)
-            if result:
+            result = self._explore_one(ep)
+            if result and self.checkpoint is None:
                 self.report.append(result)
+        self._finish_run()
+        return self.report
+
+    async def explore_all_async(self) -> List[dict]:
+        """
+        Explores endpoints concurrently.
+
+        At most `max_concurrency` endpoints are explored at once and at most
+        `per_host_limit` probes are in flight against a single host. Results
+        keep the endpoint order, so the report matches `explore_all`.
+        """
+        self._start_run()
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+
+            async def explore(ep):
+                async with semaphore:
+                    return await loop.run_in_executor(
+                        executor, self._explore_one, ep
+                    )
+
+            results = await asyncio.gather(
+                *(explore(ep) for ep in self.endpoints)
+            )
+
+        if self.checkpoint is None:
+            self.report.extend(result for result in results if result)
+        self._finish_run()
         return self.report
 
+    # --------------------------------------------------
+    # Run Scope
+    # --------------------------------------------------
+    def _start_run(self):
+        # Memoized responses never outlive a single exploration run
+        self._memo = RunMemo()
+
+    def _finish_run(self):
+        if self.etag_store:
+            self.etag_store.save()
+
+        if self.behavior_cache is not None:
+            self.behavior_cache.save()
+
+        # With a checkpoint the report is read back from disk lazily
+        if self.checkpoint is not None:
+            self.report = self.checkpoint.report(self.endpoints)
+
+    def _explore_one(self, endpoint: dict) -> Optional[dict]:
+        key = endpoint_key(endpoint)
+
+        if self.checkpoint is not None and key in self.checkpoint:
+            # Still in the spec: its cache entry must survive save()
+            if self.behavior_cache is not None:
+                self.behavior_cache.keep(key)
+            return None
+
+        behavior = self._explore_or_reuse(key, endpoint)
+
+        if self.checkpoint is None:
+            return behavior
+
+        self.checkpoint.append(key, behavior)
+        return None
+
+    def _explore_or_reuse(self, key: str, endpoint: dict) -> Optional[dict]:
+        if self.behavior_cache is None:
+            return self.explore_endpoint(endpoint)
+
+        fingerprint = endpoint.get("fingerprint")
+        hit, behavior = self.behavior_cache.lookup(key, fingerprint)
+        if hit:
+            return behavior
+
+        behavior = self.explore_endpoint(endpoint)
+        self.behavior_cache.store(key, fingerprint, behavior)
+        return behavior
+
     # --------------------------------------------------
     # Preferred Role Selection
     # --------------------------------------------------
@@ -45,6 +198,16 @@ class BehaviorExplorer:
     # Endpoint Exploration
     # --------------------------------------------------
     def explore_endpoint(self, endpoint: dict) -> Optional[dict]:
+        self._latency.start()
+        behavior = self._explore_endpoint(endpoint)
+        latency = self._latency.finish()
+
+        if behavior is not None:
+            behavior["latency"] = latency
+
+        return behavior
+
+    def _explore_endpoint(self, endpoint: dict) -> Optional[dict]:
         method = endpoint["method"].upper()
         path = endpoint["path"]
         full_url = f"{self.base_url}{path}"
@@ -60,11 +223,21 @@ class BehaviorExplorer:
             "pagination": False,
             "sorting": False,
             "filtering": False,
+            "capability_sources": {},
             "async": False,
             "response_schema": None,
             "error_patterns": {},
         }
 
+        # Spec-declared capabilities need no live probe
+        capabilities = self.infer_capabilities(endpoint)
+        for flag, declared in capabilities.items():
+            if declared is None:
+                behavior["capability_sources"][flag] = "none"
+            else:
+                behavior[flag] = declared
+                behavior["capability_sources"][flag] = "spec"
+
         headers = self.get_preferred_role_headers()
         response = self.safe_call(method, full_url, headers=headers)
 
@@ -72,23 +245,143 @@ class BehaviorExplorer:
             return behavior
 
         behavior["response_schema"] = self.capture_runtime_schema(response)
-        behavior["pagination"] = self.detect_pagination(method, full_url)
-        behavior["sorting"] = self.detect_sorting(method, full_url)
-        behavior["filtering"] = self.detect_filtering(method, full_url)
+
+        probes = {
+            "pagination": self.detect_pagination,
+            "sorting": self.detect_sorting,
+            "filtering": self.detect_filtering,
+        }
+        for flag, detect in probes.items():
+            if capabilities[flag] is None:
+                behavior[flag] = bool(detect(method, full_url))
+                behavior["capability_sources"][flag] = "probe"
+
         behavior["async"] = self.detect_async_behavior(response)
         behavior["error_patterns"] = self.detect_error_patterns(method, full_url)
 
         return behavior
 
+    # --------------------------------------------------
+    # Spec Capability Inference
+    # --------------------------------------------------
+    def infer_capabilities(self, endpoint: dict) -> Dict[str, Optional[bool]]:
+        """
+        Decides pagination/sorting/filtering from declared query parameters.
+        Returns None for a flag when the spec is ambiguous and a probe is needed.
+        """
+        parameters = endpoint.get("parameters")
+
+        # No normalized parameter list: nothing declared either way
+        if parameters is None:
+            return {flag: None for flag in CAPABILITY_PARAMS}
+
+        query_params = [p for p in parameters if p.get("in") == "query"]
+        names = {str(p.get("name", "")).lower() for p in query_params}
+
+        # Free-form object parameters (deepObject etc.) may carry anything,
+        # and so may parameters whose $ref could not be resolved
+        open_ended = any(p.get("type") == "object" for p in query_params) or any(
+            p.get("in") is None for p in parameters
+        )
+
+        capabilities = {}
+        for flag, known_names in CAPABILITY_PARAMS.items():
+            if names & known_names:
+                capabilities[flag] = True
+            elif open_ended:
+                capabilities[flag] = None
+            else:
+                capabilities[flag] = False
+
+        return capabilities
+
     # --------------------------------------------------
     # Safe Call Wrapper
     # --------------------------------------------------
     def safe_call(self, method, url, **kwargs):
-        try:
-            return requests.request(method, url, timeout=10, **kwargs)
-        except Exception:
+        method = method.upper()
+
+        # Only header-only calls of safe methods are fingerprinted
+        if method not in MEMOIZABLE_METHODS or set(kwargs) - {"headers"}:
+            return self._send(method, url, None, **kwargs)
+
+        identity = header_identity(kwargs.get("headers"), self.role_headers)
+        fingerprint = request_fingerprint(method, url, identity)
+
+        if not self.memoize:
+            return self._send(method, url, fingerprint, **kwargs)
+
+        return self._memo.fetch(
+            fingerprint,
+            lambda: self._send(method, url, fingerprint, **kwargs),
+        )
+
+    def _send(self, method, url, fingerprint, **kwargs):
+        revalidate = bool(self.etag_store and fingerprint and method == "GET")
+
+        if revalidate:
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                **self.etag_store.revalidation_headers(fingerprint),
+            }
+
+        response = self._throttled_request(method, url, **kwargs)
+        if response is None:
             return None
 
+        if revalidate:
+            response = self.etag_store.resolve(fingerprint, response)
+
+        return response
+
+    def _throttled_request(self, method, url, **kwargs):
+        """
+        Sends through the rate controller; throttled responses are
+        retried (see should_retry) after the controller has backed off
+        (and waited out Retry-After).
+        """
+        # Latency baseline per method + path template
+        rate_key = f"{method.upper()} {urlsplit(url).path}"
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_controller.acquire()
+            response = None
+            with self._host_limit(url):
+                take_connect_time()
+                started = time.perf_counter()
+                try:
+                    response = self.transport.request(
+                        method, url, timeout=10, stream=True, **kwargs
+                    )
+                    read_capped(response, self.max_body_bytes)
+                except Exception:
+                    response = None
+                finally:
+                    elapsed = time.perf_counter() - started
+                    connect = take_connect_time()
+
+                    # Cassette responses carry the timing of the recorded call
+                    recorded = getattr(response, "recorded_timing", None)
+                    if recorded is not None:
+                        elapsed, connect = recorded
+
+                    self._latency.record(elapsed, connect)
+                    self.rate_controller.release(response, elapsed, key=rate_key)
+
+            if not should_retry(method, response):
+                return response
+
+        return response
+
+    def _host_limit(self, url) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._host_limits_lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_limits[host] = limit
+        return limit
+
     # --------------------------------------------------
     # Role Detection
     # --------------------------------------------------
@@ -182,37 +475,14 @@ class BehaviorExplorer:
     # --------------------------------------------------
     def capture_runtime_schema(self, response):
         try:
-            data = response.json()
-            return self.build_schema_from_json(data)
+            text = response.content.decode("utf-8", errors="replace")
+            return infer_schema(
+                text,
+                max_items=self.schema_sample_size,
+                complete=not getattr(response, "truncated", False),
+            )
         except Exception:
             return None
 
     def build_schema_from_json(self, data):
-        if isinstance(data, dict):
-            return {
-                "type": "object",
-                "properties": {
-                    k: self.build_schema_from_json(v)
-                    for k, v in data.items()
-                },
-            }
-
-        elif isinstance(data, list):
-            if data:
-                return {
-                    "type": "array",
-                    "items": self.build_schema_from_json(data[0]),
-                }
-            return {"type": "array"}
-
-        elif isinstance(data, str):
-            return {"type": "string"}
-
-        elif isinstance(data, int):
-            return {"type": "integer"}
-
-        elif isinstance(data, bool):
-            return {"type": "boolean"}
-
-        else:
-            return {"type": "null"}
+        return build_schema(data, self.schema_sample_size)
@@ -0,0 +1,231 @@
+"""
+Cassette Transport
+------------------
+Record / replay of every HTTP exchange the agent makes.
+
+- record: calls go to the network and are saved to the cassette
+- replay: calls are served from the cassette, zero network
+
+Layout:
+  <cassette>/exchanges.jsonl     one line per exchange (no bodies)
+  <cassette>/bodies/ab/abcd...gz gzip bodies keyed by SHA-256,
+                                 identical bodies are stored once
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from agent.http_transport import (
+    DEFAULT_MAX_BODY_BYTES,
+    HttpTransport,
+    get_transport,
+    read_capped,
+    take_connect_time,
+)
+from agent.response_cache import build_response, header_identity, normalize_url
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Conditional headers change between runs but not the exchange itself
+_VOLATILE_HEADERS = {"if-none-match", "if-modified-since"}
+
+# The stored body is already decoded
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised in replay mode for a request that was never recorded.
+    """
+
+
+def exchange_key(method: str, url: str, **kwargs) -> str:
+    headers = {
+        k: v
+        for k, v in (kwargs.get("headers") or {}).items()
+        if str(k).lower() not in _VOLATILE_HEADERS
+    }
+
+    payload = json.dumps(
+        {
+            "params": kwargs.get("params"),
+            "data": kwargs.get("data"),
+            "json": kwargs.get("json"),
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+    return " ".join(
+        [
+            method.upper(),
+            normalize_url(url),
+            header_identity(headers),
+            hashlib.sha256(payload.encode()).hexdigest()[:16],
+        ]
+    )
+
+
+class BodyStore:
+    """
+    Compressed, content-addressed body storage.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.gz")
+
+    def put(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(body, mtime=0))
+            os.replace(tmp_path, path)
+
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        with open(self._path(digest), "rb") as f:
+            return gzip.decompress(f.read())
+
+
+class CassetteTransport:
+    """
+    Drop-in replacement for HttpTransport that records or replays.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = REPLAY,
+        inner: Optional[HttpTransport] = None,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.inner = inner or get_transport()
+        self.max_body_bytes = max_body_bytes
+        self.bodies = BodyStore(os.path.join(path, "bodies"))
+
+        self._index_path = os.path.join(path, "exchanges.jsonl")
+        self._lock = threading.Lock()
+        self._exchanges: Dict[str, List[dict]] = {}
+        self._served: Dict[str, int] = {}
+        self._log = None
+
+        if mode == RECORD:
+            os.makedirs(path, exist_ok=True)
+            self._log = open(self._index_path, "w", encoding="utf-8")
+        else:
+            self._load()
+
+    # --------------------------------------------------
+    # Request API (mirrors HttpTransport)
+    # --------------------------------------------------
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        key = exchange_key(method, url, **kwargs)
+
+        if self.mode == REPLAY:
+            return self._replay(key, url)
+        return self._record(key, method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+    # --------------------------------------------------
+    # Record
+    # --------------------------------------------------
+    def _record(self, key: str, method: str, url: str, **kwargs) -> requests.Response:
+        take_connect_time()
+        started = time.perf_counter()
+
+        response = self.inner.request(method, url, **kwargs)
+        if kwargs.get("stream"):
+            read_capped(response, self.max_body_bytes)
+
+        elapsed = time.perf_counter() - started
+        connect = take_connect_time()
+
+        exchange = {
+            "key": key,
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": {
+                k: v
+                for k, v in response.headers.items()
+                if k.lower() not in _DROPPED_RESPONSE_HEADERS
+            },
+            "body": self.bodies.put(response.content),
+            "truncated": getattr(response, "truncated", False),
+            "elapsed": elapsed,
+            "connect": connect,
+        }
+
+        with self._lock:
+            self._log.write(json.dumps(exchange) + "\n")
+            self._log.flush()
+
+        response.recorded_timing = (elapsed, connect)
+        return response
+
+    # --------------------------------------------------
+    # Replay
+    # --------------------------------------------------
+    def _load(self):
+        if not os.path.exists(self._index_path):
+            raise FileNotFoundError(f"No cassette recorded at {self.path}")
+
+        with open(self._index_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                exchange = json.loads(line)
+                self._exchanges.setdefault(exchange["key"], []).append(exchange)
+
+    def _replay(self, key: str, url: str) -> requests.Response:
+        with self._lock:
+            recorded = self._exchanges.get(key)
+            if not recorded:
+                raise CassetteMissError(f"No recorded exchange for {key}")
+
+            # Repeated requests replay in recorded order, then stick to the last
+            position = self._served.get(key, 0)
+            self._served[key] = position + 1
+            exchange = recorded[min(position, len(recorded) - 1)]
+
+        response = build_response(
+            exchange["status_code"],
+            exchange["headers"],
+            self.bodies.get(exchange["body"]),
+            exchange.get("url") or url,
+        )
+        response.truncated = exchange.get("truncated", False)
+        response.recorded_timing = (exchange["elapsed"], exchange["connect"])
+        return response
@@ -0,0 +1,128 @@
+"""
+Behavior Checkpoint
+-------------------
+Append-only JSONL record of explored endpoints.
+
+Guarantees:
+- Each endpoint is flushed + fsynced as soon as it finishes
+- A torn last line (crash mid-write) is discarded on resume
+- The report is read back lazily, so memory does not grow
+  with the number of endpoints
+"""
+
+import json
+import os
+import threading
+from collections.abc import Sequence
+from typing import Dict, List, Optional
+
+
+def endpoint_key(endpoint: dict) -> str:
+    return f"{endpoint['method'].upper()} {endpoint['path']}"
+
+
+class BehaviorCheckpoint:
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self._offsets: Dict[str, int] = {}
+        self._skipped = set()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        if resume and os.path.exists(path):
+            self._index_existing()
+        else:
+            open(path, "wb").close()
+
+        self._writer = open(path, "ab")
+        self._reader = open(path, "rb")
+
+    # --------------------------------------------------
+    # Resume
+    # --------------------------------------------------
+    def _index_existing(self):
+        valid_until = 0
+
+        with open(self.path, "rb") as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("torn line")
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+
+                self._offsets[entry["key"]] = offset
+                if entry["behavior"] is None:
+                    self._skipped.add(entry["key"])
+                valid_until = f.tell()
+
+        # Drop anything after the last complete entry
+        with open(self.path, "r+b") as f:
+            f.truncate(valid_until)
+
+    # --------------------------------------------------
+    # Write / Read
+    # --------------------------------------------------
+    def __contains__(self, key: str) -> bool:
+        return key in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def append(self, key: str, behavior: Optional[dict]):
+        line = json.dumps({"key": key, "behavior": behavior}, default=str) + "\n"
+
+        with self._lock:
+            offset = self._writer.tell()
+            self._writer.write(line.encode("utf-8"))
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._offsets[key] = offset
+            if behavior is None:
+                self._skipped.add(key)
+
+    def load(self, key: str) -> Optional[dict]:
+        with self._lock:
+            self._reader.seek(self._offsets[key])
+            line = self._reader.readline()
+        return json.loads(line)["behavior"]
+
+    def report(self, endpoints: List[dict]) -> "CheckpointReport":
+        keys = [
+            key
+            for key in map(endpoint_key, endpoints)
+            if key in self._offsets and key not in self._skipped
+        ]
+        return CheckpointReport(self, keys)
+
+    def close(self):
+        with self._lock:
+            self._writer.close()
+            self._reader.close()
+
+
+class CheckpointReport(Sequence):
+    """
+    Behavior report backed by the checkpoint file, in endpoint order.
+    Entries are loaded from disk when accessed.
+    """
+
+    def __init__(self, checkpoint: BehaviorCheckpoint, keys: List[str]):
+        self._checkpoint = checkpoint
+        self._keys = keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._checkpoint.load(key) for key in self._keys[index]]
+        return self._checkpoint.load(self._keys[index])
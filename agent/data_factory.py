@@ -8,28 +8,58 @@ Guarantees:
 - Same test case → same data every run
 - No flaky behavior
 - CI reproducibility
+
+Hash modes:
+- COMPAT: SHA-256, the original output (existing suites stay byte-identical)
+- FAST: CRC-32, much cheaper but produces different values
 """
 
 import hashlib
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+COMPAT = "compat"
+FAST = "fast"
+
+_HASHED_TYPES = {"string", "integer", "number"}
+
+# Process-local memo of hashed values (all immutable)
+_MEMO: Dict[tuple, Any] = {}
+_MEMO_LIMIT = 1 << 16
+_MISSING = object()
 
 
 def _stable_hash(value: str) -> int:
-    return int(hashlib.sha256(value.encode()).hexdigest(), 16)
+    return int.from_bytes(hashlib.sha256(value.encode()).digest(), "big")
+
+
+def _fast_hash(value: str) -> int:
+    return zlib.crc32(value.encode())
+
 
+_HASHES = {COMPAT: _stable_hash, FAST: _fast_hash}
 
-def deterministic_value(tc_id: str, field: str, type_name: str):
-    seed = f"{tc_id}:{field}"
-    h = _stable_hash(seed)
 
+def field_hash(tc_id: str, field: str, mode: str = COMPAT) -> int:
+    """
+    The raw hash behind deterministic_value, for callers that derive
+    their own values (e.g. constraint-aware generation).
+    """
+    return _HASHES[mode](f"{tc_id}:{field}")
+
+
+def _from_hash(h: int, field: str, type_name: str):
     if type_name == "string":
         return f"{field}_{h % 10000}"
 
     if type_name == "integer":
         return h % 100
 
-    if type_name == "number":
-        return round((h % 1000) / 10, 2)
+    return round((h % 1000) / 10, 2)
 
+
+def _constant(type_name: str):
+    # Types whose value does not depend on the hash
     if type_name == "boolean":
         return True
 
@@ -40,3 +70,67 @@ def deterministic_value(tc_id: str, field: str, type_name: str):
         return {}
 
     return None
+
+
+def _hashed_value(tc_id: str, field: str, type_name: str, mode: str):
+    key = (tc_id, field, type_name, mode)
+    value = _MEMO.get(key, _MISSING)
+
+    if value is _MISSING:
+        value = _from_hash(_HASHES[mode](f"{tc_id}:{field}"), field, type_name)
+        if len(_MEMO) >= _MEMO_LIMIT:
+            _MEMO.clear()
+        _MEMO[key] = value
+
+    return value
+
+
+def deterministic_value(tc_id: str, field: str, type_name: str, mode: str = COMPAT):
+    if type_name in _HASHED_TYPES:
+        return _hashed_value(tc_id, field, type_name, mode)
+
+    return _constant(type_name)
+
+
+def deterministic_values(
+    triples: Iterable[Tuple[str, str, str]],
+    mode: str = COMPAT,
+) -> List[Any]:
+    """
+    Batched deterministic_value: one value per (tc_id, field, type), in order.
+    """
+    hash_value = _HASHES[mode]
+    memo = _MEMO
+    values = []
+    append = values.append
+
+    for tc_id, field, type_name in triples:
+        if type_name not in _HASHED_TYPES:
+            append(_constant(type_name))
+            continue
+
+        key = (tc_id, field, type_name, mode)
+        value = memo.get(key, _MISSING)
+
+        if value is _MISSING:
+            value = _from_hash(hash_value(f"{tc_id}:{field}"), field, type_name)
+            if len(memo) >= _MEMO_LIMIT:
+                memo.clear()
+            memo[key] = value
+
+        append(value)
+
+    return values
+
+
+def value_generator(type_name: str, mode: str = COMPAT) -> Callable[[str, str], Any]:
+    """
+    Returns a (tc_id, field) -> value function specialized for one type.
+    """
+    if mode not in _HASHES:
+        raise ValueError(f"Unknown hash mode: {mode}")
+
+    if type_name in _HASHED_TYPES:
+        return lambda tc_id, field: _hashed_value(tc_id, field, type_name, mode)
+
+    return lambda tc_id, field: _constant(type_name)
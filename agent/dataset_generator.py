@@ -0,0 +1,298 @@
+"""
+Dataset Generator
+-----------------
+Streams large, reproducible synthetic datasets for a DTO
+(an operation request body or a component schema).
+
+- Row i of a dataset is always the same record (seeded per column)
+- Constraint keywords (enum, format, length, range, pattern, minItems...)
+  are honored like in generated payloads, over wider value ranges
+- Values are generated column by column, in chunks: NumPy vectorizes
+  the hashing when installed, the pure-Python path gives identical rows
+- Memory is bounded by the chunk size, not the row count
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterator, List, Optional
+
+from resolution.constraints import constrained_value, has_constraints
+from resolution.ref_table import RECURSIVE_REF, RefTable
+from resolution.schema_analyzer import SchemaAnalyzer
+from resolution.schema_view import SchemaView, component_view
+
+try:
+    import numpy as np
+except ImportError:  # optional
+    np = None
+
+_MASK64 = (1 << 64) - 1
+
+# Fixed epoch so date / date-time columns do not depend on the clock
+_EPOCH = datetime(2024, 1, 1)
+_DATE_RANGE_SECONDS = 365 * 24 * 3600
+
+# Distinct values per constrained column where the schema leaves the range open
+_CONSTRAINED_SPAN = 100000000
+
+
+# --------------------------------------------------
+# Hashing (SplitMix64 finalizer)
+# --------------------------------------------------
+def _mix(x: int) -> int:
+    z = (x + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _mix_array(x):
+    z = x + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _column_salt(seed: str, path: str) -> int:
+    digest = hashlib.sha256(f"{seed}:{path}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _hash_column(salt: int, start: int, stop: int, use_numpy: bool) -> List[int]:
+    if use_numpy:
+        rows = np.arange(start, stop, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            return _mix_array(rows + np.uint64(salt)).tolist()
+    return [_mix((salt + row) & _MASK64) for row in range(start, stop)]
+
+
+# --------------------------------------------------
+# Column formatters: hashes -> values
+# --------------------------------------------------
+def _string_column(field: str) -> Callable[[List[int]], list]:
+    prefix = f"{field}_"
+    return lambda hashes: [f"{prefix}{h % 100000000}" for h in hashes]
+
+
+def _integer_column(hashes):
+    return [h % 100000 for h in hashes]
+
+
+def _number_column(hashes):
+    return [(h % 100000) / 100 for h in hashes]
+
+
+def _boolean_column(hashes):
+    return [bool(h & 1) for h in hashes]
+
+
+# Version 4 / RFC 4122 variant bits, as uuid.UUID(version=4) sets them
+_UUID_CLEAR = ~((0xF000 << 64) | (0xC000 << 48))
+_UUID_SET = (0x4000 << 64) | (0x8000 << 48)
+
+
+def _uuid_column(hashes):
+    values = []
+    for h in hashes:
+        x = f"{(((h << 64) | _mix(h)) & _UUID_CLEAR) | _UUID_SET:032x}"
+        values.append(f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}")
+    return values
+
+
+def _date_time_column(hashes):
+    return [
+        (_EPOCH + timedelta(seconds=h % _DATE_RANGE_SECONDS)).isoformat()
+        for h in hashes
+    ]
+
+
+def _date_column(hashes):
+    start = date(2024, 1, 1)
+    return [(start + timedelta(days=h % 365)).isoformat() for h in hashes]
+
+
+def _constrained_column(schema, schema_type: str, field: str):
+    return lambda hashes: [
+        constrained_value(schema, schema_type, field, h, _CONSTRAINED_SPAN) for h in hashes
+    ]
+
+
+def _enum_column(values: list):
+    return lambda hashes: [values[h % len(values)] for h in hashes]
+
+
+def _nulls(columns, size):
+    return [None] * size
+
+
+class DatasetGenerator:
+    """
+    Column-oriented generator of schema-valid records.
+    """
+
+    def __init__(
+        self,
+        schema,
+        seed: str = "dataset",
+        array_items: int = 1,
+        use_numpy: Optional[bool] = None,
+    ):
+        self.seed = seed
+        self.array_items = array_items
+        self.use_numpy = (np is not None) if use_numpy is None else use_numpy
+
+        if self.use_numpy and np is None:
+            raise ImportError("numpy is not installed")
+
+        # (salt, formatter) per leaf column
+        self._columns = []
+        self._build_rows = self._plan(schema, "$", "value")
+
+    @classmethod
+    def for_operation(cls, swagger_spec: dict, path: str, method: str, **options):
+        operation = SchemaAnalyzer().describe(swagger_spec, path, method)
+        return cls(operation.request_schema, **options)
+
+    @classmethod
+    def for_component(cls, swagger_spec: dict, name: str, **options):
+        table = RefTable.for_spec(swagger_spec)
+        return cls(component_view(table, f"#/components/schemas/{name}"), **options)
+
+    # --------------------------------------------------
+    # Plan: schema -> leaf columns + chunk assembler
+    # (each assembler turns the chunk's columns into one value list)
+    # --------------------------------------------------
+    def _leaf(self, path: str, formatter) -> Callable[[list, int], list]:
+        index = len(self._columns)
+        self._columns.append((_column_salt(self.seed, path), formatter))
+        return lambda columns, size: columns[index]
+
+    def _plan(self, schema, path: str, field: str) -> Callable[[list, int], list]:
+        if not isinstance(schema, (dict, SchemaView)):
+            return _nulls
+
+        # Normalize anyOf (first non-null option)
+        if "anyOf" in schema:
+            for option in schema["anyOf"]:
+                if option.get("type") != "null":
+                    schema = option
+                    break
+
+        if schema.get(RECURSIVE_REF):
+            return _nulls
+
+        schema_type = schema.get("type", "string")
+        schema_format = schema.get("format")
+
+        if "enum" in schema and schema["enum"]:
+            return self._leaf(path, _enum_column(list(schema["enum"])))
+
+        if schema_format == "uuid":
+            return self._leaf(path, _uuid_column)
+
+        if schema_format == "date-time":
+            return self._leaf(path, _date_time_column)
+
+        if schema_format == "date":
+            return self._leaf(path, _date_column)
+
+        if schema_type == "object":
+            keys = []
+            children = []
+            for key, value in schema.get("properties", {}).items():
+                keys.append(key)
+                children.append(self._plan(value, f"{path}.{key}", key))
+
+            def build_objects(columns, size):
+                if not keys:
+                    return [{} for _ in range(size)]
+                values = [build(columns, size) for build in children]
+                return [dict(zip(keys, row)) for row in zip(*values)]
+
+            return build_objects
+
+        if schema_type == "array":
+            item_schema = schema.get("items", {})
+            count = max(self.array_items, schema.get("minItems", 0))
+            if schema.get("maxItems") is not None:
+                count = min(count, schema["maxItems"])
+
+            if item_schema.get(RECURSIVE_REF) or not count:
+                return lambda columns, size: [[] for _ in range(size)]
+
+            items = [
+                self._plan(item_schema, f"{path}[{i}]", field)
+                for i in range(count)
+            ]
+
+            def build_arrays(columns, size):
+                values = [build(columns, size) for build in items]
+                return [list(row) for row in zip(*values)]
+
+            return build_arrays
+
+        # minLength / pattern / minimum / multipleOf / email / date ...
+        if has_constraints(schema):
+            return self._leaf(path, _constrained_column(schema, schema_type, field))
+
+        if schema_type == "integer":
+            return self._leaf(path, _integer_column)
+
+        if schema_type == "number":
+            return self._leaf(path, _number_column)
+
+        if schema_type == "boolean":
+            return self._leaf(path, _boolean_column)
+
+        if schema_type == "string":
+            return self._leaf(path, _string_column(field))
+
+        return _nulls
+
+    # --------------------------------------------------
+    # Streaming
+    # --------------------------------------------------
+    def chunks(self, count: int, start: int = 0, chunk_size: int = 10000) -> Iterator[List[Any]]:
+        """
+        Yields rows [start, start + count) in lists of at most chunk_size.
+        """
+        stop = start + count
+
+        for chunk_start in range(start, stop, chunk_size):
+            chunk_stop = min(chunk_start + chunk_size, stop)
+
+            columns = [
+                formatter(_hash_column(salt, chunk_start, chunk_stop, self.use_numpy))
+                for salt, formatter in self._columns
+            ]
+
+            yield self._build_rows(columns, chunk_stop - chunk_start)
+
+    def rows(self, count: int, start: int = 0, chunk_size: int = 10000) -> Iterator[Any]:
+        for chunk in self.chunks(count, start, chunk_size):
+            yield from chunk
+
+    def write_jsonl(self, path: str, count: int, start: int = 0, chunk_size: int = 10000) -> int:
+        """
+        Writes the dataset as JSON lines, one chunk at a time.
+        The file appears atomically once complete.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        written = 0
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for chunk in self.chunks(count, start, chunk_size):
+                    f.write("".join(json.dumps(row) + "\n" for row in chunk))
+                    written += len(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        return written
@@ -0,0 +1,211 @@
+"""
+HTTP Transport
+--------------
+Shared, pooled HTTP sessions for every outbound call
+the agent (and the generated suite) makes.
+
+Guarantees:
+- One keep-alive session per host
+- Connections reused across probes and tests
+- No state shared between callers: sessions never store cookies
+  (pass cookies= explicitly; Set-Cookie stays readable on the response)
+- Configurable pool sizes (arguments or environment)
+- Connect time of new connections is observable per thread
+"""
+
+import http.cookiejar
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+DEFAULT_MAX_BODY_BYTES = 1024 * 1024
+
+# --------------------------------------------------
+# Connect Timing
+# --------------------------------------------------
+_connect_timing = threading.local()
+
+
+def take_connect_time() -> Optional[float]:
+    """
+    Returns (and clears) seconds spent opening connections on this
+    thread since the last call; None when a pooled connection was reused.
+    """
+    seconds = getattr(_connect_timing, "seconds", None)
+    _connect_timing.seconds = None
+    return seconds
+
+
+def _record_connect(started: float):
+    elapsed = time.perf_counter() - started
+    _connect_timing.seconds = (getattr(_connect_timing, "seconds", None) or 0.0) + elapsed
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class HttpTransport:
+    """
+    Routes requests through per-host pooled sessions.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+    # Session Management
+    # --------------------------------------------------
+    def session_for(self, url: str) -> requests.Session:
+        parts = urlsplit(url)
+        host_key = f"{parts.scheme}://{parts.netloc}"
+
+        with self._lock:
+            session = self._sessions.get(host_key)
+            if session is None:
+                session = self._new_session()
+                self._sessions[host_key] = session
+        return session
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        # A role login must not authenticate later no-auth probes / tests
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        adapter = _TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    # --------------------------------------------------
+    # Request API (mirrors requests module functions)
+    # --------------------------------------------------
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+# --------------------------------------------------
+# Capped Body Reads
+# --------------------------------------------------
+def read_capped(response: requests.Response, max_bytes: int) -> requests.Response:
+    """
+    Reads at most `max_bytes` of a (streamed) body into `response.content`.
+    Larger bodies are cut off and their connection discarded;
+    `response.truncated` tells whether that happened.
+    """
+    chunks = []
+    size = 0
+    truncated = False
+
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        remaining = max_bytes - size
+        if len(chunk) > remaining:
+            chunks.append(chunk[:remaining])
+            truncated = True
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+
+    if truncated:
+        response.close()
+
+    response._content = b"".join(chunks)
+    response._content_consumed = True
+    response.truncated = truncated or getattr(response, "truncated", False)
+    return response
+
+
+# --------------------------------------------------
+# Shared Transport
+# --------------------------------------------------
+_shared_transport: Optional[HttpTransport] = None
+_shared_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = HttpTransport()
+        return _shared_transport
+
+
+def configure_transport(**pool_options) -> HttpTransport:
+    """
+    Replaces the shared transport, e.g. to change pool sizes.
+    """
+    global _shared_transport
+    with _shared_lock:
+        previous = _shared_transport
+        _shared_transport = HttpTransport(**pool_options)
+
+    if previous is not None:
+        previous.close()
+
+    return _shared_transport
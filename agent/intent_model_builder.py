@@ -41,6 +41,7 @@ class IntentModelBuilder:
             "pagination": ep.get("pagination", False),
             "sorting": ep.get("sorting", False),
             "filtering": ep.get("filtering", False),
+            "latency": ep.get("latency"),
         }
 
     # --------------------------------------------------
@@ -0,0 +1,63 @@
+"""
+Latency Profile
+---------------
+Collects probe timings per endpoint and summarizes them
+into the `latency` block of a behavior report entry.
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(values_ms: List[float]) -> Dict:
+    if not values_ms:
+        return {"samples": 0}
+
+    ordered = sorted(values_ms)
+    return {
+        "samples": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "p50_ms": round(_percentile(ordered, 50), 3),
+        "p95_ms": round(_percentile(ordered, 95), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+class LatencyRecorder:
+    """
+    Thread-local sample buffer: each endpoint is explored on one thread,
+    so probes record into the buffer of the endpoint being explored.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def start(self):
+        self._local.total_ms = []
+        self._local.connect_ms = []
+
+    def record(self, total_seconds: float, connect_seconds: Optional[float]):
+        total_ms = getattr(self._local, "total_ms", None)
+        if total_ms is None:
+            return
+
+        total_ms.append(total_seconds * 1000)
+        if connect_seconds is not None:
+            self._local.connect_ms.append(connect_seconds * 1000)
+
+    def finish(self) -> Dict:
+        total_ms = getattr(self._local, "total_ms", None) or []
+        connect_ms = getattr(self._local, "connect_ms", None) or []
+        self._local.total_ms = None
+        self._local.connect_ms = None
+
+        profile = summarize(total_ms)
+        profile["connect"] = summarize(connect_ms)
+        return profile
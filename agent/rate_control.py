@@ -0,0 +1,173 @@
+"""
+Rate Control
+------------
+Pluggable throttling for exploration traffic.
+
+- RateController: no throttling (pass-through)
+- AIMDRateController: additive increase / multiplicative decrease
+  of the in-flight window, honoring Retry-After
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Status codes that mean "slow down"
+THROTTLE_STATUSES = {429, 503}
+
+# Methods that may be re-sent after any throttle response
+RETRYABLE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After is either delay-seconds or an HTTP-date.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def should_retry(method: str, response) -> bool:
+    """
+    Throttled safe methods are retried; other methods only on a 429
+    with Retry-After (the server refused the request, nothing ran).
+    """
+    if response is None or response.status_code not in THROTTLE_STATUSES:
+        return False
+    if method.upper() in RETRYABLE_METHODS:
+        return True
+    return response.status_code == 429 and bool(response.headers.get("Retry-After"))
+
+
+class RateController:
+    """
+    Base controller. Every call is admitted immediately.
+    """
+
+    def acquire(self):
+        return None
+
+    def release(self, response, latency: float, key: Optional[str] = None):
+        return None
+
+
+class AIMDRateController(RateController):
+    """
+    Grows the concurrency window by `increase` per window of healthy
+    responses and shrinks it by `decrease_factor` on 429/503 or when
+    latency rises above `latency_tolerance` x the baseline.
+
+    Baselines are kept per key (method + path), so slow and fast
+    endpoints are not compared, and decay toward the observed latency
+    (`baseline_decay` per response), so a uniformly slower server
+    becomes the new baseline instead of pinning the window.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 2,
+        min_limit: float = 1,
+        max_limit: float = 32,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        baseline_decay: float = 0.1,
+        max_retry_after: float = 60.0,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.baseline_decay = baseline_decay
+        self.max_retry_after = max_retry_after
+
+        self.in_flight = 0
+        self.baselines: Dict[Optional[str], float] = {}
+
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    # --------------------------------------------------
+    # Admission
+    # --------------------------------------------------
+    def acquire(self):
+        with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                    continue
+
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+
+                self._condition.wait()
+
+    # --------------------------------------------------
+    # Feedback
+    # --------------------------------------------------
+    def release(self, response, latency: float, key: Optional[str] = None):
+        with self._condition:
+            self.in_flight -= 1
+
+            status = response.status_code if response is not None else None
+
+            if status in THROTTLE_STATUSES:
+                self._decrease(key)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after:
+                    retry_after = min(retry_after, self.max_retry_after)
+                    self._paused_until = max(
+                        self._paused_until, time.monotonic() + retry_after
+                    )
+
+            elif status is not None:
+                rising = self._latency_rising(key, latency)
+                self._observe(key, latency)
+                if rising:
+                    self._decrease(key)
+                else:
+                    # Additive increase: +increase per full window of healthy responses
+                    self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+
+            self._condition.notify_all()
+
+    def _latency_rising(self, key: Optional[str], latency: float) -> bool:
+        baseline = self.baselines.get(key)
+        if baseline is None:
+            return False
+        return latency > baseline * self.latency_tolerance
+
+    def _observe(self, key: Optional[str], latency: float):
+        baseline = self.baselines.get(key)
+        if baseline is None:
+            self.baselines[key] = latency
+        else:
+            self.baselines[key] = baseline + self.baseline_decay * (latency - baseline)
+
+    def _decrease(self, key: Optional[str] = None):
+        now = time.monotonic()
+
+        # One decrease per latency period; a burst of 429s is one signal
+        cooldown = self.baselines.get(key, 0.0)
+        if now - self._last_decrease < cooldown:
+            return
+
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
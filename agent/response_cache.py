@@ -0,0 +1,206 @@
+"""
+Response Cache
+--------------
+Stops the explorer from paying twice for the same response.
+
+- RunMemo: request-fingerprint memo for safe methods,
+  scoped to one exploration run
+- ETagStore: optional cross-run If-None-Match revalidation
+  for GET probes
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from agent.rate_control import THROTTLE_STATUSES
+
+# Methods whose responses can be replayed without re-sending.
+MEMOIZABLE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+# --------------------------------------------------
+# Fingerprints
+# --------------------------------------------------
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url)
+    path = re.sub(r"/{2,}", "/", parts.path)
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, parts.query, "")
+    )
+
+
+def header_identity(headers: Optional[dict], role_headers: Optional[dict] = None) -> str:
+    """
+    Stable identity for a header set.
+    Known role headers map to the role name so identities survive
+    token refreshes between runs; anything else is hashed.
+    """
+    if not headers:
+        return "anonymous"
+
+    for role_name, known in (role_headers or {}).items():
+        if headers == known:
+            return f"role:{role_name}"
+
+    canonical = json.dumps(
+        sorted((str(k).lower(), str(v)) for k, v in headers.items())
+    )
+    return "sha256:" + hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def request_fingerprint(method: str, url: str, identity: str) -> Tuple[str, str, str]:
+    return method.upper(), normalize_url(url), identity
+
+
+# --------------------------------------------------
+# Response Reconstruction
+# --------------------------------------------------
+def build_response(
+    status_code: int,
+    headers: Dict[str, str],
+    body: bytes,
+    url: str,
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response._content_consumed = True
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+# --------------------------------------------------
+# In-Run Memo
+# --------------------------------------------------
+class _MemoEntry:
+    def __init__(self):
+        self.ready = threading.Event()
+        self.response = None
+
+
+class RunMemo:
+    """
+    Single-flight memo: concurrent callers asking for the same
+    fingerprint wait for the first request instead of sending their own.
+
+    Throttled responses (429/503) are handed to the callers already
+    waiting but not kept: the next caller sends (and retries) again.
+    """
+
+    def __init__(self):
+        self._entries: Dict[tuple, _MemoEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fetch(self, key: tuple, send: Callable[[], Optional[requests.Response]]):
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = _MemoEntry()
+                self._entries[key] = entry
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if owner:
+            try:
+                entry.response = send()
+            finally:
+                response = entry.response
+                if response is not None and response.status_code in THROTTLE_STATUSES:
+                    with self._lock:
+                        if self._entries.get(key) is entry:
+                            del self._entries[key]
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+
+        return entry.response
+
+
+# --------------------------------------------------
+# Cross-Run ETag Revalidation
+# --------------------------------------------------
+class ETagStore:
+    """
+    Persists ETag-tagged GET responses between runs.
+    A 304 answer is replaced by the stored response.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.revalidated = 0
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def _key(fingerprint: tuple) -> str:
+        return " ".join(fingerprint)
+
+    def revalidation_headers(self, fingerprint: tuple) -> dict:
+        with self._lock:
+            entry = self._entries.get(self._key(fingerprint))
+        if not entry:
+            return {}
+        return {"If-None-Match": entry["etag"]}
+
+    def resolve(self, fingerprint: tuple, response: requests.Response) -> requests.Response:
+        key = self._key(fingerprint)
+
+        if response.status_code == 304:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry:
+                    self.revalidated += 1
+            if entry:
+                return build_response(
+                    entry["status_code"],
+                    entry["headers"],
+                    base64.b64decode(entry["body"]),
+                    response.url,
+                )
+            return response
+
+        etag = response.headers.get("ETag")
+        # A body cut off by the byte cap is not worth replaying
+        if etag and response.status_code == 200 and not getattr(response, "truncated", False):
+            entry = {
+                "etag": etag,
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+                "body": base64.b64encode(response.content).decode("ascii"),
+            }
+            with self._lock:
+                self._entries[key] = entry
+
+        return response
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            snapshot = dict(self._entries)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
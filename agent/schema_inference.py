@@ -0,0 +1,267 @@
+"""
+Runtime Schema Inference
+------------------------
+Infers a JSON schema from a (possibly truncated) response body.
+
+Guarantees:
+- Only the first `max_items` items of every array are materialized;
+  the rest are skipped without building Python objects
+- Item schemas are merged incrementally (types + optionality)
+- A body cut off by the byte cap still yields the schema of
+  everything that arrived complete
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MAX_ITEMS = 20
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SKIP_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+_SCALAR = re.compile(r"[^,\]}\s]+")
+
+
+class _Truncated(Exception):
+    """Raised when the text ends before the current value does."""
+
+
+# --------------------------------------------------
+# Sampling Parser
+# --------------------------------------------------
+class _SamplingParser:
+    """
+    Recursive-descent JSON parser over a text prefix.
+    Arrays keep at most `max_items` items; the rest are skipped.
+    """
+
+    def __init__(self, text: str, max_items: int):
+        self.text = text
+        self.max_items = max_items
+
+    def _ws(self, pos: int) -> int:
+        pos = _WHITESPACE.match(self.text, pos).end()
+        if pos >= len(self.text):
+            raise _Truncated()
+        return pos
+
+    def parse_value(self, pos: int):
+        pos = self._ws(pos)
+        char = self.text[pos]
+
+        if char == "{":
+            return self._parse_object(pos)
+        if char == "[":
+            return self._parse_array(pos)
+
+        try:
+            return _DECODER.raw_decode(self.text, pos)
+        except json.JSONDecodeError:
+            end = _SCALAR.match(self.text, pos)
+            if end is None or end.end() >= len(self.text):
+                raise _Truncated()
+            raise
+
+    def _parse_object(self, pos: int):
+        result: Dict[str, Any] = {}
+        pos = self._ws(pos + 1)
+
+        if self.text[pos] == "}":
+            return result, pos + 1
+
+        try:
+            while True:
+                key, pos = self.parse_value(pos)
+                pos = self._ws(pos)
+                if self.text[pos] != ":":
+                    raise json.JSONDecodeError("Expecting ':'", self.text, pos)
+
+                try:
+                    value, pos = self.parse_value(pos + 1)
+                except _Truncated as truncated:
+                    # Keep whatever the nested container managed to parse
+                    if getattr(truncated, "partial", None) is not None:
+                        result[key] = truncated.partial
+                    raise
+                result[key] = value
+
+                pos = self._ws(pos)
+                if self.text[pos] == "}":
+                    return result, pos + 1
+                if self.text[pos] != ",":
+                    raise json.JSONDecodeError("Expecting ','", self.text, pos)
+                pos += 1
+        except _Truncated as truncated:
+            # Members parsed so far are kept, a truncated scalar is not
+            truncated.partial = result
+            raise
+
+    def _parse_array(self, pos: int):
+        items: List[Any] = []
+        pos = self._ws(pos + 1)
+
+        if self.text[pos] == "]":
+            return items, pos + 1
+
+        try:
+            while True:
+                if len(items) < self.max_items:
+                    try:
+                        item, pos = self.parse_value(pos)
+                    except _Truncated as truncated:
+                        # A partial item would look like missing fields;
+                        # it is only kept when nothing else arrived
+                        partial = getattr(truncated, "partial", None)
+                        if not items and partial is not None:
+                            items.append(partial)
+                        raise
+                    items.append(item)
+                else:
+                    pos = self._skip_value(pos)
+
+                pos = self._ws(pos)
+                if self.text[pos] == "]":
+                    return items, pos + 1
+                if self.text[pos] != ",":
+                    raise json.JSONDecodeError("Expecting ','", self.text, pos)
+                pos += 1
+        except _Truncated as truncated:
+            truncated.partial = items
+            raise
+
+    def _skip_value(self, pos: int) -> int:
+        pos = self._ws(pos)
+
+        if self.text[pos] not in "[{":
+            if self.text[pos] == '"':
+                match = _SKIP_TOKEN.match(self.text, pos)
+            else:
+                match = _SCALAR.match(self.text, pos)
+            if match is None or match.end() >= len(self.text):
+                raise _Truncated()
+            return match.end()
+
+        depth = 0
+        for match in _SKIP_TOKEN.finditer(self.text, pos):
+            token = match.group()
+            if token in "[{":
+                depth += 1
+            elif token in "]}":
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+
+        raise _Truncated()
+
+
+def sample_json(text: str, max_items: int = DEFAULT_MAX_ITEMS, complete: bool = True):
+    """
+    Parses `text`, keeping at most `max_items` items per array.
+    If `complete` is False the text may end mid-value and the
+    complete part is returned.
+    """
+    parser = _SamplingParser(text, max_items)
+
+    try:
+        value, _ = parser.parse_value(0)
+        return value
+    except _Truncated as truncated:
+        partial = getattr(truncated, "partial", None)
+        if complete or partial is None:
+            raise ValueError("Incomplete JSON document")
+        return partial
+
+
+# --------------------------------------------------
+# Schema Building + Merging
+# --------------------------------------------------
+def build_schema(data, max_items: int = DEFAULT_MAX_ITEMS) -> Dict:
+    if isinstance(data, dict):
+        return {
+            "type": "object",
+            "properties": {
+                k: build_schema(v, max_items)
+                for k, v in data.items()
+            },
+            "required": list(data.keys()),
+        }
+
+    if isinstance(data, list):
+        items_schema: Optional[Dict] = None
+        for item in data[:max_items]:
+            item_schema = build_schema(item, max_items)
+            items_schema = (
+                item_schema
+                if items_schema is None
+                else merge_schemas(items_schema, item_schema)
+            )
+
+        if items_schema is None:
+            return {"type": "array"}
+        return {"type": "array", "items": items_schema}
+
+    if isinstance(data, bool):
+        return {"type": "boolean"}
+
+    if isinstance(data, int):
+        return {"type": "integer"}
+
+    if isinstance(data, float):
+        return {"type": "number"}
+
+    if isinstance(data, str):
+        return {"type": "string"}
+
+    return {"type": "null"}
+
+
+def _types(schema: Dict) -> List[str]:
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        return list(schema_type)
+    return [schema_type] if schema_type else []
+
+
+def merge_schemas(left: Dict, right: Dict) -> Dict:
+    types = _types(left)
+    for schema_type in _types(right):
+        if schema_type not in types:
+            types.append(schema_type)
+
+    if "integer" in types and "number" in types:
+        types.remove("integer")
+
+    merged: Dict[str, Any] = {"type": types[0] if len(types) == 1 else types}
+
+    if "object" in types:
+        left_props = left.get("properties", {})
+        right_props = right.get("properties", {})
+
+        properties = dict(left_props)
+        for key, schema in right_props.items():
+            properties[key] = (
+                merge_schemas(properties[key], schema)
+                if key in properties
+                else schema
+            )
+
+        # A field is required only if every object sample had it
+        left_required = left.get("required", []) if "object" in _types(left) else []
+        right_required = set(right.get("required", [])) if "object" in _types(right) else set()
+        merged["properties"] = properties
+        merged["required"] = [key for key in left_required if key in right_required]
+
+    if "array" in types:
+        left_items = left.get("items")
+        right_items = right.get("items")
+        if left_items and right_items:
+            merged["items"] = merge_schemas(left_items, right_items)
+        elif left_items or right_items:
+            merged["items"] = left_items or right_items
+
+    return merged
+
+
+def infer_schema(text: str, max_items: int = DEFAULT_MAX_ITEMS, complete: bool = True) -> Dict:
+    return build_schema(sample_json(text, max_items, complete), max_items)
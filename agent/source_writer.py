@@ -0,0 +1,76 @@
+"""
+Source Writer
+-------------
+Streams generated source code to disk.
+
+- Chunks go straight to a buffered file handle (no in-memory copy
+  of the whole file)
+- Leading / trailing whitespace of the whole file is dropped, like
+  writing `code.strip()`
+- The target appears atomically: a temp file is renamed over it on close
+- The target gets the usual new-file mode (0666 minus the umask),
+  not the 0600 of the temp file
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def default_file_mode() -> int:
+    """
+    Mode open() would give a new file: 0666 minus the process umask.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+class StreamingSourceWriter:
+    def __init__(self, path: Union[str, Path], buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, self._tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        self._file = os.fdopen(fd, "w", encoding="utf-8", buffering=buffer_size)
+
+        self._started = False
+        # Trailing whitespace is held back until more text follows it
+        self._pending = ""
+
+    def write(self, chunk: str):
+        if not self._started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return
+            self._started = True
+
+        body = chunk.rstrip()
+        if not body:
+            self._pending += chunk
+            return
+
+        self._file.write(self._pending)
+        self._file.write(body)
+        self._pending = chunk[len(body):]
+
+    def close(self):
+        self._file.close()
+        os.chmod(self._tmp_path, default_file_mode())
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        os.unlink(self._tmp_path)
+
+    def __enter__(self) -> "StreamingSourceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -1,24 +1,33 @@
-import requests
+import hashlib
+import json
+from typing import Dict, Optional, Set
 
+from agent.http_transport import HttpTransport, get_transport
 
-def read_swagger(swagger_url: str) -> dict:
-    response = requests.get(swagger_url, timeout=10)
+
+def read_swagger(swagger_url: str, transport: Optional[HttpTransport] = None) -> dict:
+    transport = transport or get_transport()
+    response = transport.get(swagger_url, timeout=10)
     response.raise_for_status()
     return response.json()
 
 
-def _extract_parameters(path_level_params, operation_level_params):
+def _extract_parameters(path_level_params, operation_level_params, spec: Optional[dict] = None):
     """
     Merge path-level and operation-level parameters.
     Normalize schema structure to always include:
     name, in, required, type, format
+
+    $ref parameters (and parameter schemas) are resolved against the spec;
+    one that cannot be resolved keeps name / in as None.
     """
     merged = []
 
     all_params = (path_level_params or []) + (operation_level_params or [])
 
     for param in all_params:
-        schema = param.get("schema", {})
+        param = _dereference(spec, param)
+        schema = _dereference(spec, param.get("schema", {}))
 
         merged.append(
             {
@@ -33,6 +42,94 @@ def _extract_parameters(path_level_params, operation_level_params):
     return merged
 
 
+# ----------------------------
+# Operation Fingerprints
+# ----------------------------
+
+def _resolve_pointer(spec: dict, ref: str):
+    node = spec
+    for part in ref.lstrip("#/").split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if not isinstance(node, dict):
+            return None
+        node = node.get(part)
+    return node
+
+
+def _dereference(spec: Optional[dict], node):
+    """
+    Follows a (chain of) local $ref; unresolvable references yield {}.
+    """
+    seen = set()
+    while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+        ref = node["$ref"]
+        if spec is None or ref in seen or not ref.startswith("#/"):
+            return {}
+        seen.add(ref)
+        node = _resolve_pointer(spec, ref)
+    return node if isinstance(node, dict) else {}
+
+
+def _direct_refs(node) -> Set[str]:
+    refs = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/"):
+                refs.add(ref)
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return refs
+
+
+class OperationFingerprinter:
+    """
+    Stable hash of an operation and every component it references
+    (transitively). Component bodies are scanned once per spec.
+    """
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self._refs_of: Dict[str, Set[str]] = {}
+
+    def _component_refs(self, ref: str) -> Set[str]:
+        if ref not in self._refs_of:
+            self._refs_of[ref] = _direct_refs(_resolve_pointer(self.spec, ref))
+        return self._refs_of[ref]
+
+    def _closure(self, node) -> Set[str]:
+        seen: Set[str] = set()
+        pending = list(_direct_refs(node))
+        while pending:
+            ref = pending.pop()
+            if ref in seen:
+                continue
+            seen.add(ref)
+            pending.extend(self._component_refs(ref) - seen)
+        return seen
+
+    def fingerprint(self, method: str, path: str, path_level_params, details: dict) -> str:
+        operation = {
+            "method": method.upper(),
+            "path": path,
+            "parameters": (path_level_params or []) + (details.get("parameters") or []),
+            "requestBody": details.get("requestBody"),
+            "responses": details.get("responses", {}),
+        }
+        operation["components"] = {
+            ref: _resolve_pointer(self.spec, ref)
+            for ref in sorted(self._closure(operation))
+        }
+
+        canonical = json.dumps(
+            operation, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+
 def extract_endpoints(spec: dict):
     base_url = ""
     if spec.get("servers"):
@@ -40,6 +137,7 @@ def extract_endpoints(spec: dict):
 
     paths = spec.get("paths", {})
     endpoints = []
+    fingerprinter = OperationFingerprinter(spec)
 
     for path, path_item in paths.items():
 
@@ -63,6 +161,7 @@ def extract_endpoints(spec: dict):
             normalized_params = _extract_parameters(
                 path_level_params,
                 operation_level_params,
+                spec,
             )
 
             endpoints.append(
@@ -72,6 +171,12 @@ def extract_endpoints(spec: dict):
                     "parameters": normalized_params,
                     "requestBody": details.get("requestBody"),
                     "responses": details.get("responses", {}),
+                    "fingerprint": fingerprinter.fingerprint(
+                        method,
+                        path,
+                        path_level_params,
+                        details,
+                    ),
                 }
             )
 
@@ -1,25 +1,57 @@
+import hashlib
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import textwrap
 import re
-import itertools
 import json
-from agent.data_factory import deterministic_value
+from typing import Optional
+from agent.data_factory import COMPAT, deterministic_value
 from resolution.engine import TestDataResolutionEngine
 from resolution.contracts import TestStepResolutionRequest
+from resolution.payload_compiler import shared_compiler
+from resolution.resolution_cache import ResolutionCache
+from resolution.schema_analyzer import SchemaAnalyzer
+from agent.source_writer import StreamingSourceWriter, default_file_mode
 import uuid
 
+try:
+    import msgpack
+except ImportError:  # optional, manifest_format="msgpack" only
+    msgpack = None
+
 API_TEST_FILE = Path("automation/api/test_generated_api.py")
+API_TEST_DIR = API_TEST_FILE.parent
+API_RUNTIME_FILE = Path("automation/utils/api_runtime.py")
+SHARD_PREFIX = "test_api_"
+
+# First line of every sharded module; marks files that may be replaced or removed
+GENERATED_MARKER = "# Generated by agent.test_generator. Do not edit."
 
-TC_COUNTER = itertools.count(1)
+# Must match automation/manifest_plugin.py
+MANIFEST_SUFFIXES = {"json": ".manifest.json", "msgpack": ".manifest.msgpack"}
+MANIFEST_GENERATOR = "agent.test_generator"
+MANIFEST_VERSION = 1
+
+# Input / output hashes of every generated file, for incremental runs
+GENERATION_MANIFEST = API_TEST_DIR / ".generation_manifest.json"
+# Bump whenever the generated output changes for unchanged inputs
+GENERATION_VERSION = 3
 
 
 # ----------------------------
 # Helpers
 # ----------------------------
 
-def next_tc_id() -> str:
-    return f"TC_API_{next(TC_COUNTER):03d}"
+def stable_tc_id(ep: dict, slot: str) -> str:
+    """
+    Test case id derived from the operation and the case slot, so it
+    does not depend on the position of the endpoint in the model.
+    """
+    key = f"{ep['method'].upper()} {ep['endpoint']}#{slot}"
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"TC_API_{int(digest[:12], 16) % 10**10:010d}"
 
 
 def safe_test_name(value: str) -> str:
@@ -46,107 +78,144 @@ def bdd_test_name(method: str, path: str) -> str:
 # Schema-Based Payload Builder
 # ----------------------------
 
-def build_payload_from_schema(schema: dict, tc_id: str, parent_field: str = ""):
-    if not schema:
-        return None
-
-    print(f'schema: {schema}')
-    schema_type = schema.get("type")
+def build_payload_from_schema(schema: dict, tc_id: str, parent_field: str = "", hash_mode: str = COMPAT):
+    # Compiled once per schema, then run per test case
+    return shared_compiler(hash_mode, plain=True).compile(schema)(tc_id, parent_field)
 
-    if schema_type == "object":
-        properties = schema.get("properties", {})
-        result = {}
-        for field, field_schema in properties.items():
-            result[field] = build_payload_from_schema(
-                field_schema,
-                tc_id,
-                parent_field=field,
-            )
-        return result
-
-    if schema_type == "array":
-        item_schema = schema.get("items", {})
-        return [build_payload_from_schema(item_schema, tc_id, parent_field)]
-
-    return deterministic_value(tc_id, parent_field, schema_type)
 
-
-def generate_payload_from_intent(ep: dict, tc_id: str):
+def generate_payload_from_intent(ep: dict, tc_id: str, hash_mode: str = COMPAT):
     request_schema = ep.get("request_schema")
 
     if not request_schema:
         return None
 
-    return build_payload_from_schema(request_schema, tc_id)
+    return build_payload_from_schema(request_schema, tc_id, hash_mode=hash_mode)
 
 
-def generate_query_params_from_intent(ep: dict, tc_id: str):
+def generate_query_params_from_intent(ep: dict, tc_id: str, hash_mode: str = COMPAT):
     query_schema = ep.get("query_schema")
     if not query_schema:
         return None
 
-    return build_payload_from_schema(query_schema, tc_id)
+    return build_payload_from_schema(query_schema, tc_id, hash_mode=hash_mode)
+
+def build_role_context() -> dict:
+    return {
+        "role": "system",
+        "token": None,
+        "restricted_fields": [],
+        "credentials": {
+        "username": os.getenv("ADMIN_USERNAME"),
+        "password": os.getenv("ADMIN_PASSWORD"),
+        "client_id": os.getenv("CLIENT_ID"),
+        "client_secret": os.getenv("CLIENT_SECRET"),
+        "grant_type": os.getenv("GRANT_TYPE"),
+        "scope": os.getenv("SCOPE", "")
+        }
+    }
+
+
+def build_resolution_request(ep: dict, tc_id: str, swagger_spec: dict, role_context: dict):
+    return TestStepResolutionRequest(
+        endpoint=ep["endpoint"],
+        http_method=ep["method"],
+        swagger_spec=swagger_spec,
+        intent_metadata=ep.get("intent_metadata", {}),
+        role_context=role_context,
+        execution_context={},
+        deterministic_seed=int(tc_id.split("_")[-1]),
+    )
+
 
 def resolve_with_engine(ep: dict, tc_id: str, swagger_spec_from_Parent: dict):
     """
     Uses TestDataResolutionEngine to resolve payload + query safely.
     Falls back to schema-based builder if resolution fails.
     """
+    return resolve_all_with_engine([ep], [tc_id], swagger_spec_from_Parent)[0]
 
-    try:
-        engine = TestDataResolutionEngine()
-
-        swagger_spec =  swagger_spec_from_Parent  # In real implementation, this would be passed down or accessed globally
-        role_context = {
-            "role": "system",
-            "token": None,
-            "restricted_fields": [],
-            "credentials": {
-            "username": os.getenv("ADMIN_USERNAME"),
-            "password": os.getenv("ADMIN_PASSWORD"),
-            "client_id": os.getenv("CLIENT_ID"),
-            "client_secret": os.getenv("CLIENT_SECRET"),
-            "grant_type": os.getenv("GRANT_TYPE"),
-            "scope": os.getenv("SCOPE", "")
-            }
-        }
 
-        resolution_request = TestStepResolutionRequest(
-            endpoint=ep["endpoint"],
-            http_method=ep["method"],
-            swagger_spec=swagger_spec,
-            intent_metadata=ep.get("intent_metadata", {}),
-            role_context=role_context,
-            execution_context={},
-            deterministic_seed=int(tc_id.split("_")[-1]),
-        )
+def resolve_all_with_engine(
+    endpoints: list,
+    tc_ids: list,
+    swagger_spec: dict,
+    cache: Optional[ResolutionCache] = None,
+    observers: Optional[list] = None,
+    hash_mode: str = COMPAT,
+):
+    """
+    Resolves payload + query for every endpoint in one engine batch.
+    Returns (payload, query, content_type) per endpoint, in order;
+    an endpoint that fails falls back to the schema-based builder.
+    """
 
-        resolved = engine.resolve(resolution_request)
+    engine = TestDataResolutionEngine(cache=cache, observers=observers, hash_mode=hash_mode)
+    role_context = build_role_context()
 
-        return (
+    slots = []
+    requests = []
+
+    for ep, tc_id in zip(endpoints, tc_ids):
+        try:
+            requests.append(build_resolution_request(ep, tc_id, swagger_spec, role_context))
+            slots.append(None)
+        except Exception as exception:
+            slots.append(exception)
+
+    resolved_iter = iter(engine.resolve_many(requests, return_exceptions=True))
+
+    test_data = []
+
+    for ep, tc_id, slot in zip(endpoints, tc_ids, slots):
+        resolved = slot if slot is not None else next(resolved_iter)
+
+        if isinstance(resolved, Exception):
+            # Safe fallback to existing behavior
+            print(f"Error resolving test data: {resolved}")
+            payload = generate_payload_from_intent(ep, tc_id, hash_mode)
+            query = generate_query_params_from_intent(ep, tc_id, hash_mode)
+            test_data.append((payload, query, None))
+            continue
+
+        test_data.append(
+            (
                 resolved.body,
                 resolved.query_params,
                 resolved.request_content_type,
-                )
-    except Exception as exception:
-        # Safe fallback to existing behavior
-        print(f"Error resolving test data: {exception}")
-        payload = generate_payload_from_intent(ep, tc_id)
-        query = generate_query_params_from_intent(ep, tc_id)
-        return payload, query
+            )
+        )
 
+    return test_data
 
-# ----------------------------
-# Main generator
-# ----------------------------
 
-def generate_tests(base_url: str, intent_model: list, swagger_spec: dict):
+def assign_tc_ids(ep: dict) -> dict:
+    """
+    Test case ids of one endpoint (the base id also seeds its data).
+    """
+    roles_info = ep.get("roles", {})
+
+    return {
+        "base": stable_tc_id(ep, "base"),
+        "roles": {
+            role_name: stable_tc_id(ep, f"role:{role_name}")
+            for role_name in roles_info.get("role_access", {})
+        },
+        "without_auth": (
+            stable_tc_id(ep, "without_auth")
+            if roles_info.get("requires_auth", False)
+            else None
+        ),
+        "contract": stable_tc_id(ep, "contract"),
+    }
 
-    API_TEST_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    header_block = f"""import pytest
-import requests
+# ----------------------------
+# Templates
+# ----------------------------
+
+render_header = """import pytest
 import logging
+from agent.http_transport import get_transport
 from resolution.lifecycle_engine import LifecycleChainingEngine
 from resolution.execution_context import ExecutionContext
 
@@ -166,83 +235,39 @@ def log_request_response(method, url, response):
 
 def safe_request(method, url, **kwargs):
     try:
-        return requests.request(method, url, timeout=15, **kwargs)
+        return get_transport().request(method, url, timeout=15, **kwargs)
     except Exception as e:
         logging.exception("Request failed")
         pytest.fail(str(e))
 
-"""
-
-    code = header_block
-
-    creation_endpoints = [ep for ep in intent_model if ep.get("classification") == "create"]
-    non_creation_endpoints = [ep for ep in intent_model if ep.get("classification") != "create"]
-    ordered_endpoints = creation_endpoints + non_creation_endpoints
-
-    for ep in ordered_endpoints:
-
-        method = ep["method"].upper()
-        raw_path = ep["endpoint"]
-        tc_id_base = next_tc_id()
-
-        runtime_path = replace_path_params_with_swagger(
-            raw_path,
-            method,
-            swagger_spec,
-            tc_id_base,
-        )
-
-        classification = ep.get("classification", "unknown")
-        risk = ep.get("risk_level", "medium")
-        roles_info = ep.get("roles", {})
-        role_access = roles_info.get("role_access", {})
-        requires_auth = roles_info.get("requires_auth", False)
-
-        test_base_name = bdd_test_name(method, raw_path)
-        url_expr = f'f"{{BASE_URL}}{runtime_path}"'
-
-        payload, query_params, content_type = resolve_with_engine(
-            ep, tc_id_base, swagger_spec
-        )
-
-        payload_code = json.dumps(payload, indent=4) if payload else "None"
-        query_code = json.dumps(query_params, indent=4) if query_params else "None"
+""".format
 
-        # --------------------------------------------------
-        # ROLE BASED TESTS
-        # --------------------------------------------------
-        if role_access:
-
-            for role_name, is_allowed in role_access.items():
-
-                tc_id = next_tc_id()
-                fixture_name = f"{role_name}_headers"
+render_shard_header = """{marker}
+import pytest
+from automation.utils.api_runtime import (
+    BASE_URL,
+    EXECUTION_CONTEXT,
+    LifecycleChainingEngine,
+    log_request_response,
+    safe_request,
+)
 
-                if is_allowed:
+""".format
 
-                    request_block = (
-                        f"""response = safe_request(
-        "{method}",
-        url,
-        headers={fixture_name},"""
-                    )
+# Marks every case of a create endpoint
+LIFECYCLE_CREATE_LINE = "@pytest.mark.lifecycle_create\n"
 
-                    if content_type == "application/x-www-form-urlencoded":
-                        request_block += """
-        data=payload if payload else None,"""
-                    else:
-                        request_block += """
+JSON_BODY_ARG = """
         json=payload if payload else None,"""
 
-                    request_block += """
-        params=query if query else None
-    )"""
+FORM_BODY_ARG = """
+        data=payload if payload else None,"""
 
-                    code += f"""
+render_allowed_test = """
 @pytest.mark.functional
 @pytest.mark.rbac
 @pytest.mark.{risk}
-def test_{test_base_name}_as_{role_name}({fixture_name}):
+{lifecycle_mark}def test_{test_base_name}_as_{role_name}({fixture_name}):
     \"\"\"
     Test Case ID: {tc_id}
     Role: {role_name}
@@ -254,14 +279,17 @@ def test_{test_base_name}_as_{role_name}({fixture_name}):
     payload = {payload_code}
     query = {query_code}
 
-    {request_block}
+    response = safe_request(
+        "{method}",
+        url,
+        headers={fixture_name},{body_arg}
+        params=query if query else None
+    )
 
     log_request_response("{method}", url, response)
-"""
+""".format
 
-                    # Lifecycle capture ONLY for create
-                    if classification == "create":
-                        code += """
+LIFECYCLE_CAPTURE_BLOCK = """
     try:
         data = response.json()
         captured = LifecycleChainingEngine.extract_resource_values(data, {})
@@ -270,63 +298,588 @@ def test_{test_base_name}_as_{role_name}({fixture_name}):
         pass
 """
 
-                    code += """
+SUCCESS_ASSERT_BLOCK = """
     assert response.status_code in (200, 201, 202, 204)
 """
 
-                else:
-
-                    code += f"""
+render_forbidden_test = """
 @pytest.mark.security
 @pytest.mark.rbac
 @pytest.mark.{risk}
-def test_{test_base_name}_as_{role_name}_forbidden({fixture_name}):
+{lifecycle_mark}def test_{test_base_name}_as_{role_name}_forbidden({fixture_name}):
 
     url = {url_expr}
     response = safe_request("{method}", url, headers={fixture_name})
     log_request_response("{method}", url, response)
 
     assert response.status_code in (401, 403)
-"""
-
-        # --------------------------------------------------
-        # UNAUTHENTICATED TEST
-        # --------------------------------------------------
-        if requires_auth:
+""".format
 
-            tc_id = next_tc_id()
-
-            code += f"""
+render_without_auth_test = """
 @pytest.mark.security
 @pytest.mark.{risk}
-def test_{test_base_name}_without_auth():
+{lifecycle_mark}def test_{test_base_name}_without_auth():
 
     url = {url_expr}
     response = safe_request("{method}", url)
     log_request_response("{method}", url, response)
 
     assert response.status_code in (401, 403)
-"""
+""".format
 
-        # --------------------------------------------------
-        # CONTRACT TEST
-        # --------------------------------------------------
-        tc_id = next_tc_id()
-
-        code += f"""
+render_contract_test = """
 @pytest.mark.contract
 @pytest.mark.{risk}
-def test_{test_base_name}_contract_stability():
+{lifecycle_mark}def test_{test_base_name}_contract_stability():
 
     url = {url_expr}
     response = safe_request("{method}", url)
     log_request_response("{method}", url, response)
 
     assert response.status_code < 500
+""".format
+
+# Table-driven emission: one case row per test, one shared executor
+TABLE_IMPORTS = """from automation.utils.api_cases import case_params, run_case
+
 """
 
-    API_TEST_FILE.write_text(code.strip(), encoding="utf-8")
-    print(f"[GENERATED] {API_TEST_FILE}")
+TABLE_TEST = """
+
+@pytest.mark.parametrize("case", case_params(CASES, endpoints=ENDPOINTS))
+def test_api_case(case, request):
+    role = case[2]
+    headers = request.getfixturevalue(f"{role}_headers") if role else None
+    run_case(ENDPOINTS[case[0]], case, BASE_URL, EXECUTION_CONTEXT, headers)
+"""
+
+
+# ----------------------------
+# Main generator
+# ----------------------------
+
+def generate_tests(
+    base_url: str,
+    intent_model: list,
+    swagger_spec: dict,
+    resolution_cache: Optional[ResolutionCache] = None,
+    observers: Optional[list] = None,
+    shard_by: Optional[str] = "tag",
+    max_workers: Optional[int] = None,
+    emit_style: str = "functions",
+    manifest_format: str = "json",
+    incremental: bool = True,
+    hash_mode: str = COMPAT,
+):
+    """
+    Generates the API suite.
+
+    shard_by="tag" / "resource" writes one module per OpenAPI tag /
+    top-level resource plus a shared runtime module; shard_by=None
+    writes the single legacy test_generated_api.py.
+
+    emit_style="functions" writes one test function per case;
+    "table" writes case tables run by one parametrized test;
+    "manifest" writes no Python, only case manifests (manifest_format
+    "json" or "msgpack") collected by automation/manifest_plugin.py.
+
+    With incremental=True only files whose inputs changed since the
+    last run (see GENERATION_MANIFEST) are resolved and rewritten.
+
+    hash_mode="fast" generates payloads with the cheaper data_factory
+    hash (different values than the default "compat").
+    """
+    if emit_style not in ("functions", "table", "manifest"):
+        raise ValueError(f"Unknown emit_style: {emit_style}")
+    if emit_style == "manifest":
+        if manifest_format not in MANIFEST_SUFFIXES:
+            raise ValueError(f"Unknown manifest_format: {manifest_format}")
+        if manifest_format == "msgpack" and msgpack is None:
+            raise ImportError("msgpack is not installed")
+
+    creation_endpoints = [ep for ep in intent_model if ep.get("classification") == "create"]
+    non_creation_endpoints = [ep for ep in intent_model if ep.get("classification") != "create"]
+    ordered_endpoints = creation_endpoints + non_creation_endpoints
+
+    tc_plan = [assign_tc_ids(ep) for ep in ordered_endpoints]
+
+    # Output file of every endpoint, in emission order
+    outputs = {}
+    for index, ep in enumerate(ordered_endpoints):
+        if shard_by is None:
+            path = API_TEST_FILE
+        else:
+            path = API_TEST_DIR / f"{SHARD_PREFIX}{shard_name(ep, swagger_spec, shard_by)}.py"
+        if emit_style == "manifest":
+            path = path.with_name(path.stem + MANIFEST_SUFFIXES[manifest_format])
+        outputs.setdefault(path, []).append(index)
+
+    # --------------------------------------------------
+    # Incremental: skip files whose inputs did not change
+    # --------------------------------------------------
+    settings = {
+        "version": GENERATION_VERSION,
+        "base_url": base_url,
+        "shard_by": shard_by,
+        "emit_style": emit_style,
+        "manifest_format": manifest_format,
+        "hash_mode": hash_mode,
+        "role_context": build_role_context(),
+    }
+    previous = load_generation_manifest() if incremental else {}
+    analyzer = SchemaAnalyzer()
+    input_keys = {
+        path: generation_key(
+            settings,
+            [(ordered_endpoints[index], tc_plan[index]) for index in indexes],
+            swagger_spec,
+            analyzer,
+        )
+        for path, indexes in outputs.items()
+    }
+    changed = [
+        path for path in outputs
+        if not is_current(path, input_keys[path], previous)
+    ]
+
+    # Only endpoints of changed files are resolved, in one batch
+    pending = sorted(index for path in changed for index in outputs[path])
+    test_data = []
+    if pending:
+        test_data = resolve_all_with_engine(
+            [ordered_endpoints[index] for index in pending],
+            [tc_plan[index]["base"] for index in pending],
+            swagger_spec,
+            cache=resolution_cache,
+            observers=observers,
+            hash_mode=hash_mode,
+        )
+
+    jobs = {}
+    for index, (payload, query_params, content_type) in zip(pending, test_data):
+        ep = ordered_endpoints[index]
+        jobs[index] = {
+            "ep": ep,
+            "tc_ids": tc_plan[index],
+            "payload": payload,
+            "query_params": query_params,
+            "content_type": content_type,
+            "path_defaults": path_param_defaults(
+                ep["endpoint"],
+                ep["method"].upper(),
+                swagger_spec,
+                tc_plan[index]["base"],
+            ),
+        }
+
+    modules = {path: [jobs[index] for index in outputs[path]] for path in changed}
+    written = set(modules)
+
+    if emit_style == "manifest":
+        # --------------------------------------------------
+        # Manifests (collected by automation/manifest_plugin.py)
+        # --------------------------------------------------
+        for path, module_jobs in modules.items():
+            write_manifest(path, base_url, module_jobs, manifest_format)
+
+    elif shard_by is None:
+        for path, module_jobs in modules.items():
+            render_shard(str(path), render_header(base_url=base_url), module_jobs, emit_style)
+
+    else:
+        # --------------------------------------------------
+        # Sharded suite
+        # --------------------------------------------------
+        runtime = GENERATED_MARKER + "\n" + render_header(base_url=base_url)
+        runtime_key = hashlib.sha256(runtime.encode()).hexdigest()
+        if not is_current(API_RUNTIME_FILE, runtime_key, previous):
+            with StreamingSourceWriter(API_RUNTIME_FILE) as out:
+                out.write(runtime)
+            written.add(API_RUNTIME_FILE)
+        input_keys[API_RUNTIME_FILE] = runtime_key
+
+        header = render_shard_header(marker=GENERATED_MARKER)
+
+        if len(modules) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(render_shard, str(path), header, shard_jobs, emit_style)
+                    for path, shard_jobs in modules.items()
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for path, shard_jobs in modules.items():
+                render_shard(str(path), header, shard_jobs, emit_style)
+
+    remove_stale_outputs(set(outputs))
+
+    files = {}
+    for path, input_key in input_keys.items():
+        entry = previous.get(path.as_posix())
+        if path in written or entry is None:
+            entry = {"inputs": input_key, "output": file_hash(path)}
+        files[path.as_posix()] = entry
+    if files != previous:
+        save_generation_manifest(files)
+
+    print(
+        f"[GENERATED] {len(written)} of {len(input_keys)} files "
+        f"({len(input_keys) - len(written)} unchanged)"
+    )
+
+
+# ----------------------------
+# Incremental generation
+# ----------------------------
+
+# Intent fields the renderers read; per-run measurements (latency...) are left out
+RENDERED_INTENT_FIELDS = (
+    "endpoint",
+    "method",
+    "classification",
+    "risk_level",
+    "roles",
+    "intent_metadata",
+    "request_schema",
+    "query_schema",
+)
+
+
+def generation_key(settings: dict, endpoints: list, swagger_spec: dict, analyzer: SchemaAnalyzer) -> str:
+    """
+    Hash of everything one generated file depends on: the generator
+    settings and, per endpoint, the rendered intent fields, test ids
+    and the spec fingerprint of its operation.
+    """
+    entries = []
+
+    for ep, tc_ids in endpoints:
+        try:
+            fingerprint = analyzer.fingerprint(swagger_spec, ep["endpoint"], ep["method"])
+        except Exception:
+            fingerprint = None
+        intent = {field: ep.get(field) for field in RENDERED_INTENT_FIELDS}
+        entries.append({"ep": intent, "tc_ids": tc_ids, "fingerprint": fingerprint})
+
+    canonical = json.dumps(
+        {"settings": settings, "endpoints": entries},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def is_current(path: Path, input_key: str, previous: dict) -> bool:
+    """
+    True when the file was generated from the same inputs and has not
+    been modified (or removed) since.
+    """
+    entry = previous.get(path.as_posix())
+    if entry is None or entry.get("inputs") != input_key:
+        return False
+    return path.exists() and file_hash(path) == entry.get("output")
+
+
+def load_generation_manifest() -> dict:
+    try:
+        with open(GENERATION_MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if manifest.get("version") != GENERATION_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_generation_manifest(files: dict):
+    data = json.dumps(
+        {"version": GENERATION_VERSION, "files": files}, indent=2, sort_keys=True
+    )
+    write_atomic(GENERATION_MANIFEST, data.encode("utf-8"))
+
+
+def write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, default_file_mode())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def shard_name(ep: dict, swagger_spec: dict, shard_by: str) -> str:
+    """
+    Module name of an endpoint: its first OpenAPI tag, or its top-level
+    resource (first path segment after api / version prefixes).
+    """
+    name = None
+
+    if shard_by == "tag":
+        operation = swagger_spec.get("paths", {}).get(ep["endpoint"], {}).get(ep["method"].lower(), {})
+        tags = operation.get("tags") or []
+        if tags:
+            name = str(tags[0])
+
+    if name is None:
+        segments = [
+            segment
+            for segment in ep["endpoint"].split("/")
+            if segment and not segment.startswith("{")
+        ]
+        while segments and (segments[0] == "api" or re.fullmatch(r"v\d+", segments[0])):
+            segments = segments[1:]
+        name = segments[0] if segments else "root"
+
+    return re.sub(r"[^0-9a-zA-Z]+", "_", name).strip("_").lower() or "root"
+
+
+def render_shard(path: str, header: str, jobs: list, emit_style: str = "functions") -> str:
+    """
+    Writes one test module (runs in a worker process for sharded suites).
+    """
+    with StreamingSourceWriter(path) as out:
+        out.write(header)
+        if emit_style == "table":
+            write_case_tables(out, jobs)
+        else:
+            for job in jobs:
+                write_endpoint_tests(out, **job)
+    return path
+
+
+def endpoint_cases(ep: dict, tc_ids: dict) -> list:
+    """
+    Case rows (endpoint_ref, tc_id, role, expected, risk) of one
+    endpoint, in the order write_endpoint_tests emits them.
+    """
+    endpoint_ref = bdd_test_name(ep["method"].upper(), ep["endpoint"])
+    risk = ep.get("risk_level", "medium")
+    roles_info = ep.get("roles", {})
+
+    cases = []
+    for role_name, is_allowed in roles_info.get("role_access", {}).items():
+        if is_allowed:
+            cases.append((endpoint_ref, tc_ids["roles"][role_name], role_name, "success", risk))
+        else:
+            cases.append((endpoint_ref, None, role_name, "forbidden", risk))
+
+    if roles_info.get("requires_auth", False):
+        cases.append((endpoint_ref, tc_ids["without_auth"], None, "unauthorized", risk))
+
+    cases.append((endpoint_ref, tc_ids["contract"], None, "contract", risk))
+    return cases
+
+
+def endpoint_entry(job: dict) -> dict:
+    """
+    Everything the shared executor needs to send an endpoint's cases.
+    """
+    ep = job["ep"]
+    return {
+        "method": ep["method"].upper(),
+        "path": ep["endpoint"],
+        "path_defaults": job["path_defaults"],
+        "body": "data" if job["content_type"] == "application/x-www-form-urlencoded" else "json",
+        "capture": ep.get("classification") == "create",
+        "payload": job["payload"],
+        "query": job["query_params"],
+    }
+
+
+def write_manifest(path: Path, base_url: str, jobs: list, manifest_format: str = "json"):
+    """
+    Writes the resolved cases of one module as a manifest.
+    The file appears atomically once complete.
+    """
+    manifest = {
+        "generator": MANIFEST_GENERATOR,
+        "version": MANIFEST_VERSION,
+        "base_url": base_url,
+        "endpoints": {
+            bdd_test_name(job["ep"]["method"].upper(), job["ep"]["endpoint"]): endpoint_entry(job)
+            for job in jobs
+        },
+        "cases": [
+            list(case)
+            for job in jobs
+            for case in endpoint_cases(job["ep"], job["tc_ids"])
+        ],
+    }
+
+    if manifest_format == "msgpack":
+        data = msgpack.packb(manifest, use_bin_type=True)
+    else:
+        data = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+
+    write_atomic(path, data)
+
+
+def write_case_tables(out: StreamingSourceWriter, jobs: list):
+    """
+    ENDPOINTS (one literal per endpoint, payload included once) and
+    CASES (one row per test), run by a single parametrized test.
+    """
+    out.write(TABLE_IMPORTS)
+
+    out.write("ENDPOINTS = {\n")
+    for job in jobs:
+        endpoint = endpoint_entry(job)
+        out.write(f"    {bdd_test_name(endpoint['method'], endpoint['path'])!r}: {endpoint!r},\n")
+    out.write("}\n\n")
+
+    out.write("CASES = [\n")
+    for job in jobs:
+        for case in endpoint_cases(job["ep"], job["tc_ids"]):
+            out.write(f"    {case!r},\n")
+    out.write("]\n")
+
+    out.write(TABLE_TEST)
+
+
+def remove_stale_outputs(current: set):
+    """
+    Removes generated suites that the current run did not write
+    (other shards, the monolithic file, manifests of another layout),
+    so no test is collected twice.
+    """
+    if not API_TEST_DIR.exists():
+        return
+
+    if API_TEST_FILE not in current and API_TEST_FILE.exists():
+        API_TEST_FILE.unlink()
+
+    for path in API_TEST_DIR.glob(f"{SHARD_PREFIX}*.py"):
+        if path in current:
+            continue
+        with open(path, encoding="utf-8") as f:
+            generated = f.readline().rstrip("\n") == GENERATED_MARKER
+        if generated:
+            path.unlink()
+
+    for suffix in MANIFEST_SUFFIXES.values():
+        for path in API_TEST_DIR.glob(f"*{suffix}"):
+            if path not in current:
+                path.unlink()
+
+
+def write_endpoint_tests(
+    out: StreamingSourceWriter,
+    ep: dict,
+    tc_ids: dict,
+    payload,
+    query_params,
+    content_type,
+    path_defaults: dict,
+):
+
+    method = ep["method"].upper()
+    raw_path = ep["endpoint"]
+    runtime_path = runtime_path_expr(raw_path, path_defaults)
+
+    classification = ep.get("classification", "unknown")
+    risk = ep.get("risk_level", "medium")
+    roles_info = ep.get("roles", {})
+    role_access = roles_info.get("role_access", {})
+    requires_auth = roles_info.get("requires_auth", False)
+
+    test_base_name = bdd_test_name(method, raw_path)
+    url_expr = f'f"{{BASE_URL}}{runtime_path}"'
+
+    # Create cases run before every other module's cases (automation/lifecycle_order.py)
+    lifecycle_mark = LIFECYCLE_CREATE_LINE if classification == "create" else ""
+
+    payload_code = json.dumps(payload, indent=4) if payload else "None"
+    query_code = json.dumps(query_params, indent=4) if query_params else "None"
+
+    if content_type == "application/x-www-form-urlencoded":
+        body_arg = FORM_BODY_ARG
+    else:
+        body_arg = JSON_BODY_ARG
+
+    # --------------------------------------------------
+    # ROLE BASED TESTS
+    # --------------------------------------------------
+    for role_name, is_allowed in role_access.items():
+
+        tc_id = tc_ids["roles"][role_name]
+        fixture_name = f"{role_name}_headers"
+
+        if is_allowed:
+
+            out.write(
+                render_allowed_test(
+                    method=method,
+                    risk=risk,
+                    lifecycle_mark=lifecycle_mark,
+                    test_base_name=test_base_name,
+                    role_name=role_name,
+                    fixture_name=fixture_name,
+                    tc_id=tc_id,
+                    classification=classification,
+                    url_expr=url_expr,
+                    payload_code=payload_code,
+                    query_code=query_code,
+                    body_arg=body_arg,
+                )
+            )
+
+            # Lifecycle capture ONLY for create
+            if classification == "create":
+                out.write(LIFECYCLE_CAPTURE_BLOCK)
+
+            out.write(SUCCESS_ASSERT_BLOCK)
+
+        else:
+
+            out.write(
+                render_forbidden_test(
+                    method=method,
+                    risk=risk,
+                    lifecycle_mark=lifecycle_mark,
+                    test_base_name=test_base_name,
+                    role_name=role_name,
+                    fixture_name=fixture_name,
+                    url_expr=url_expr,
+                )
+            )
+
+    # --------------------------------------------------
+    # UNAUTHENTICATED TEST
+    # --------------------------------------------------
+    if requires_auth:
+
+        out.write(
+            render_without_auth_test(
+                method=method,
+                risk=risk,
+                lifecycle_mark=lifecycle_mark,
+                test_base_name=test_base_name,
+                url_expr=url_expr,
+            )
+        )
+
+    # --------------------------------------------------
+    # CONTRACT TEST
+    # --------------------------------------------------
+    out.write(
+        render_contract_test(
+            method=method,
+            risk=risk,
+            lifecycle_mark=lifecycle_mark,
+            test_base_name=test_base_name,
+            url_expr=url_expr,
+        )
+    )
 
 
 def replace_path_params(path: str, tc_id: str):
@@ -341,6 +894,14 @@ def replace_path_params_with_swagger(path: str, method: str, swagger_spec: dict,
     Replaces {path} parameters using Swagger schema.
     Supports uuid format properly.
     """
+    return runtime_path_expr(path, path_param_defaults(path, method, swagger_spec, tc_id))
+
+
+def path_param_defaults(path: str, method: str, swagger_spec: dict, tc_id: str) -> dict:
+    """
+    Fallback value of every {path} parameter (used when lifecycle
+    chaining has not captured one), in path order.
+    """
 
     paths = swagger_spec.get("paths", {})
     path_item = paths.get(path, {})
@@ -357,8 +918,8 @@ def replace_path_params_with_swagger(path: str, method: str, swagger_spec: dict,
         if p.get("in") == "path"
     }
 
-    def replacer(match):
-        param_name = match.group(1)
+    defaults = {}
+    for param_name in re.findall(r"{([^}]+)}", path):
         schema = param_map.get(param_name, {})
 
         param_type = schema.get("type")
@@ -366,7 +927,7 @@ def replace_path_params_with_swagger(path: str, method: str, swagger_spec: dict,
 
         # ---- UUID FIX ----
         if param_format == "uuid":
-            fallback = str(uuid.uuid4())
+            fallback = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{tc_id}-{param_name}"))
 
         # ---- INTEGER ----
         elif param_type == "integer":
@@ -380,10 +941,20 @@ def replace_path_params_with_swagger(path: str, method: str, swagger_spec: dict,
                 param_type or "string"
             )
 
-        # Runtime-safe expression for lifecycle chaining
+        defaults[param_name] = str(fallback)
+
+    return defaults
+
+
+def runtime_path_expr(path: str, path_defaults: dict) -> str:
+    """
+    Runtime-safe f-string body for lifecycle chaining.
+    """
+    def replacer(match):
+        param_name = match.group(1)
         return (
             "{"
-            + f"EXECUTION_CONTEXT.get('{param_name}') or '{fallback}'"
+            + f"EXECUTION_CONTEXT.get('{param_name}') or '{path_defaults[param_name]}'"
             + "}"
         )
 
@@ -1,6 +1,6 @@
 import pytest
-import requests
 import logging
+from agent.http_transport import get_transport
 from resolution.lifecycle_engine import LifecycleChainingEngine
 from resolution.execution_context import ExecutionContext
 
@@ -20,7 +20,7 @@ def log_request_response(method, url, response):
 
 def safe_request(method, url, **kwargs):
     try:
-        return requests.request(method, url, timeout=15, **kwargs)
+        return get_transport().request(method, url, timeout=15, **kwargs)
     except Exception as e:
         logging.exception("Request failed")
         pytest.fail(str(e))
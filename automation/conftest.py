@@ -1,11 +1,16 @@
 import os
 import pytest
-import requests
+
+from agent.http_transport import get_transport
+# Collects the cases of *.manifest.json / *.manifest.msgpack files
+from automation.manifest_plugin import pytest_collect_file  # noqa: F401
+# Runs create cases of every module first (lifecycle chaining)
+from automation.lifecycle_order import pytest_collection_modifyitems  # noqa: F401
 
 BASE_URL = os.getenv("BASE_URL")
 
 def login(username: str, password: str) -> str:
-    response = requests.post(
+    response = get_transport().post(
         f"{BASE_URL}/api/v1/auth/auth/login",
         data={
             "grant_type": os.getenv("GRANT_TYPE", "password"),
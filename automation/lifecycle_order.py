@@ -0,0 +1,19 @@
+"""
+Lifecycle Order
+---------------
+Runs the cases of create endpoints before every other case.
+
+The single generated module lists create endpoints first, so resources
+are captured into EXECUTION_CONTEXT before any read, update or delete
+uses them. Sharded suites spread those endpoints over several modules;
+this hook restores the same creates-before-everything order across
+modules. Otherwise the order is unchanged (the sort is stable).
+
+Registered by automation/conftest.py.
+"""
+
+LIFECYCLE_CREATE = "lifecycle_create"
+
+
+def pytest_collection_modifyitems(session, config, items):
+    items.sort(key=lambda item: item.get_closest_marker(LIFECYCLE_CREATE) is None)
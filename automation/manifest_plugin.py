@@ -0,0 +1,108 @@
+"""
+Manifest Plugin
+---------------
+Collects API cases from the manifests written by the test generator
+(emit_style="manifest") and runs them through the shared executor.
+
+No Python test modules are generated or imported: regenerating the
+cases only rewrites *.manifest.json / *.manifest.msgpack files.
+
+Registered by automation/conftest.py.
+"""
+
+import json
+import logging
+
+import pytest
+
+from automation.utils.api_cases import case_id, case_marks, run_case
+from resolution.execution_context import ExecutionContext
+
+MANIFEST_SUFFIXES = (".manifest.json", ".manifest.msgpack")
+
+# Shared by every manifest, like EXECUTION_CONTEXT of the generated modules
+EXECUTION_CONTEXT = ExecutionContext()
+
+_logging_configured = False
+
+
+def pytest_collect_file(file_path, parent):
+    if file_path.name.endswith(MANIFEST_SUFFIXES):
+        return ManifestFile.from_parent(parent, path=file_path)
+    return None
+
+
+def load_manifest(path) -> dict:
+    if path.name.endswith(".msgpack"):
+        try:
+            import msgpack
+        except ImportError:  # optional
+            raise ImportError(f"msgpack is not installed (needed for {path.name})")
+
+        with open(path, "rb") as f:
+            return msgpack.unpackb(f.read(), raw=False)
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _configure_logging():
+    # Same log setup the generated modules perform on import
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[logging.FileHandler("api_test.log"), logging.StreamHandler()]
+    )
+
+
+class ManifestFile(pytest.File):
+    """
+    One manifest: yields a ManifestCase per case row, in manifest order.
+    """
+
+    def collect(self):
+        manifest = load_manifest(self.path)
+        _configure_logging()
+
+        base_url = manifest["base_url"]
+        endpoints = manifest["endpoints"]
+
+        for case in manifest["cases"]:
+            endpoint = endpoints[case[0]]
+            yield ManifestCase.from_parent(
+                self,
+                name=f"test_{case_id(case)}",
+                callobj=_case_function(endpoint, case, base_url),
+                case=case,
+                endpoint=endpoint,
+            )
+
+
+def _case_function(endpoint: dict, case, base_url: str):
+    def run_manifest_case(request):
+        role = case[2]
+        headers = request.getfixturevalue(f"{role}_headers") if role else None
+        run_case(endpoint, case, base_url, EXECUTION_CONTEXT, headers)
+
+    return run_manifest_case
+
+
+class ManifestCase(pytest.Function):
+    """
+    A case from a manifest. Subclasses Function so role header
+    fixtures resolve exactly as for generated test functions.
+    """
+
+    def __init__(self, *, case, endpoint, **kwargs):
+        super().__init__(**kwargs)
+        self.case = case
+        for name in case_marks(case, endpoint):
+            self.add_marker(name)
+
+    def reportinfo(self):
+        return self.path, None, f"{self.name} (tc: {self.case[1]})"
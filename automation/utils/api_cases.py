@@ -0,0 +1,136 @@
+"""
+Table-Driven API Cases
+----------------------
+Shared executor of the case tables written by the test generator
+(emit_style="table") and of the case manifests (emit_style="manifest").
+
+Case row: (endpoint_ref, tc_id, role, expected, risk)
+Endpoint: {"method", "path", "path_defaults", "body", "capture", "payload", "query"}
+"""
+
+import logging
+
+import pytest
+
+from agent.http_transport import get_transport
+from automation.lifecycle_order import LIFECYCLE_CREATE
+from resolution.lifecycle_engine import LifecycleChainingEngine
+
+SUCCESS = "success"
+FORBIDDEN = "forbidden"
+UNAUTHORIZED = "unauthorized"
+CONTRACT = "contract"
+
+EXPECTED_STATUS = {
+    SUCCESS: (200, 201, 202, 204),
+    FORBIDDEN: (401, 403),
+    UNAUTHORIZED: (401, 403),
+    CONTRACT: range(100, 500),
+}
+
+# Same ids and markers as the one-function-per-case emission
+_ID_SUFFIX = {
+    SUCCESS: "_as_{role}",
+    FORBIDDEN: "_as_{role}_forbidden",
+    UNAUTHORIZED: "_without_auth",
+    CONTRACT: "_contract_stability",
+}
+
+_MARKS = {
+    SUCCESS: ("functional", "rbac"),
+    FORBIDDEN: ("security", "rbac"),
+    UNAUTHORIZED: ("security",),
+    CONTRACT: ("contract",),
+}
+
+
+def case_id(case) -> str:
+    endpoint_ref, _, role, expected, _ = case
+    return endpoint_ref + _ID_SUFFIX[expected].format(role=role)
+
+
+def case_marks(case, endpoint: dict = None) -> tuple:
+    """
+    Markers of a case; cases of create endpoints (they capture the
+    created resource) also get the lifecycle ordering marker.
+    """
+    _, _, _, expected, risk = case
+    marks = _MARKS[expected] + (risk,)
+    if endpoint is not None and endpoint["capture"]:
+        marks += (LIFECYCLE_CREATE,)
+    return marks
+
+
+def case_params(cases, *expected, endpoints: dict = None):
+    """
+    pytest.param list of the rows (only those with one of the given
+    expectations, if any are given).
+    """
+    return [
+        pytest.param(
+            case,
+            id=case_id(case),
+            marks=[
+                getattr(pytest.mark, name)
+                for name in case_marks(case, endpoints[case[0]] if endpoints else None)
+            ],
+        )
+        for case in cases
+        if not expected or case[3] in expected
+    ]
+
+
+def build_url(base_url: str, endpoint: dict, execution_context) -> str:
+    """
+    Fills path parameters from captured resources, falling back to
+    the generated defaults.
+    """
+    path = endpoint["path"]
+    for name, fallback in endpoint["path_defaults"].items():
+        value = execution_context.get(name) or fallback
+        path = path.replace("{" + name + "}", str(value))
+    return base_url + path
+
+
+def send(method: str, url: str, **kwargs):
+    try:
+        response = get_transport().request(method, url, timeout=15, **kwargs)
+    except Exception as e:
+        logging.exception("Request failed")
+        pytest.fail(str(e))
+
+    logging.info(f"REQUEST {method} {url}")
+    logging.info(f"Status Code: {response.status_code}")
+    logging.info(f"Response Body: {response.text[:1000]}")
+    return response
+
+
+def run_case(endpoint: dict, case, base_url: str, execution_context, headers=None):
+    """
+    Sends one case and asserts its expected status.
+    Only successful role cases carry the payload and query.
+    """
+    _, _, _, expected, _ = case
+    url = build_url(base_url, endpoint, execution_context)
+
+    kwargs = {}
+    if headers is not None:
+        kwargs["headers"] = headers
+
+    if expected == SUCCESS:
+        payload = endpoint["payload"]
+        query = endpoint["query"]
+        kwargs[endpoint["body"]] = payload if payload else None
+        kwargs["params"] = query if query else None
+
+    response = send(endpoint["method"], url, **kwargs)
+
+    if expected == SUCCESS and endpoint["capture"]:
+        try:
+            captured = LifecycleChainingEngine.extract_resource_values(response.json(), {})
+            execution_context.register(captured)
+        except Exception:
+            pass
+
+    assert response.status_code in EXPECTED_STATUS[expected]
+    return response
@@ -0,0 +1,569 @@
+# agent/resolution/constraints.py
+
+import math
+import random
+import re
+import string
+from datetime import date, timedelta
+from fractions import Fraction
+from typing import Any, Callable, List, Optional
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from agent.data_factory import COMPAT, field_hash
+
+STRING_KEYWORDS = ("minLength", "maxLength", "pattern")
+NUMBER_KEYWORDS = ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf")
+STRING_FORMATS = ("email", "uri", "date")
+
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_URI = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:\S+$")
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Unbounded repeats (*, +, {n,}) generate at most this many extra items
+_MAX_EXTRA_REPEAT = 3
+_PATTERN_ATTEMPTS = 20
+# Length-directed values pick among the shortest lengths >= minLength
+_LENGTH_SLACK = 16
+
+# Shortest domains an email of a given maxLength can use
+_EMAIL_DOMAINS = ("@example.com", "@ex.io", "@x.io", "@x.y")
+
+
+def has_constraints(schema) -> bool:
+    """
+    True when a primitive schema carries keywords that plain
+    deterministic_value output would not satisfy.
+    """
+    if schema.get("enum"):
+        return True
+    if schema.get("format") in STRING_FORMATS:
+        return True
+    return any(keyword in schema for keyword in STRING_KEYWORDS + NUMBER_KEYWORDS)
+
+
+# --------------------------------------------------
+# Generation
+# --------------------------------------------------
+def constrained_builder(schema, schema_type: str, hash_mode: str = COMPAT) -> Callable[[str, str], Any]:
+    """
+    Builder (tc_id, field_name) -> value that satisfies the schema's
+    constraint keywords deterministically.
+    """
+    enum_values = schema.get("enum")
+    if enum_values:
+        first = enum_values[0]
+        return lambda tc_id, field_name: first
+
+    if schema_type == "integer":
+        return lambda tc_id, field_name: _integer_value(
+            schema, field_hash(tc_id, field_name, hash_mode)
+        )
+
+    if schema_type == "number":
+        return lambda tc_id, field_name: _number_value(
+            schema, field_hash(tc_id, field_name, hash_mode)
+        )
+
+    return lambda tc_id, field_name: _string_value(
+        schema, field_name, field_hash(tc_id, field_name, hash_mode)
+    )
+
+
+def constrained_value(schema, schema_type: str, field_name: str, h: int, span: Optional[int] = None):
+    """
+    The constrained value for a raw hash h. span widens the value range
+    where the schema leaves it open (None keeps the payload ranges):
+    strings / emails / uris draw from span suffixes, numbers from span
+    steps.
+    """
+    enum_values = schema.get("enum")
+    if enum_values:
+        return enum_values[h % len(enum_values)] if span else enum_values[0]
+
+    if schema_type == "integer":
+        return _integer_value(schema, h, span)
+
+    if schema_type == "number":
+        return _number_value(schema, h, span)
+
+    return _string_value(schema, field_name, h, span)
+
+
+def _string_value(schema, field_name: str, h: int, span: Optional[int] = None) -> str:
+    min_length = schema.get("minLength", 0)
+    max_length = schema.get("maxLength")
+    schema_format = schema.get("format")
+
+    if "pattern" in schema:
+        return _pattern_value(schema["pattern"], h, min_length, max_length)
+
+    suffix = h % (span or 10000)
+
+    if schema_format == "email":
+        local = re.sub(r"[^a-z0-9._-]", "", field_name.lower()) or "user"
+        value = f"{local}_{suffix}@example.com"
+    elif schema_format == "uri":
+        value = f"https://example.com/{suffix}"
+    elif schema_format == "date":
+        return (date(2024, 1, 1) + timedelta(days=h % 365)).isoformat()
+    else:
+        value = f"{field_name}_{suffix}"
+
+    if len(value) < min_length:
+        if schema_format == "email":
+            value = "x" * (min_length - len(value)) + value
+        else:
+            value = value + "x" * (min_length - len(value))
+
+    if max_length is not None and len(value) > max_length:
+        if schema_format == "email":
+            # Shorten the local part, then the domain
+            local, domain = value.split("@")[0], None
+            for candidate in _EMAIL_DOMAINS:
+                if len(candidate) < max_length:
+                    domain = candidate
+                    break
+            if domain is None:
+                raise ValueError(f"{field_name}: no email fits maxLength {max_length}")
+            # The tail keeps the per-case hash digits
+            value = local[len(local) - (max_length - len(domain)):] + domain
+        else:
+            value = value[:max_length]
+
+    return value
+
+
+def _integer_value(schema, h: int, span: Optional[int] = None) -> int:
+    low = schema.get("minimum")
+    high = schema.get("maximum")
+
+    # OpenAPI 3.0 (boolean) and 3.1 (numeric) exclusive bounds
+    exclusive_low = schema.get("exclusiveMinimum")
+    exclusive_high = schema.get("exclusiveMaximum")
+    if exclusive_low is True and low is not None:
+        low = math.floor(low) + 1
+    elif _is_number(exclusive_low):
+        low = math.floor(exclusive_low) + 1
+    if exclusive_high is True and high is not None:
+        high = math.ceil(high) - 1
+    elif _is_number(exclusive_high):
+        high = math.ceil(exclusive_high) - 1
+
+    low = math.ceil(low) if low is not None else None
+    high = math.floor(high) if high is not None else None
+
+    # Integer multiples of p/q are the multiples of p (lcm of the step and 1)
+    step = Fraction(str(schema.get("multipleOf") or 1)).numerator
+
+    width = (span or 100) - 1
+    if low is None and high is None:
+        low, high = 0, width
+    elif low is None:
+        low = high - width
+    elif high is None:
+        high = low + width
+
+    first = math.ceil(low / step) * step
+    count = (high - first) // step + 1
+    if count <= 0:
+        raise ValueError(f"No integer in [{low}, {high}] is a multiple of {step}")
+
+    return first + (h % count) * step
+
+
+def _number_value(schema, h: int, span: Optional[int] = None) -> float:
+    low = schema.get("minimum")
+    high = schema.get("maximum")
+    step = schema.get("multipleOf") or 0.1
+
+    exclusive_low = schema.get("exclusiveMinimum")
+    exclusive_high = schema.get("exclusiveMaximum")
+    if _is_number(exclusive_low):
+        low, exclusive_low = exclusive_low, True
+    if _is_number(exclusive_high):
+        high, exclusive_high = exclusive_high, True
+
+    if low is None and high is None:
+        low, high = 0, (99.9 if span is None else (span - 1) * step)
+    elif low is None:
+        low = high - (span or 100) * step
+    elif high is None:
+        high = low + (span or 100) * step
+
+    first = math.ceil(low / step)
+    last = math.floor(high / step)
+    if exclusive_low is True and first * step <= low:
+        first += 1
+    if exclusive_high is True and last * step >= high:
+        last -= 1
+
+    count = last - first + 1
+    if count <= 0:
+        raise ValueError(f"No number in [{low}, {high}] is a multiple of {step}")
+    index = first + h % count
+
+    # Round to the precision of the step
+    decimals = max(0, -math.floor(math.log10(step))) if step < 1 else 0
+    return round(index * step, decimals + 6)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _pattern_value(pattern: str, h: int, min_length: int, max_length) -> str:
+    try:
+        parsed = sre_parse.parse(pattern)
+        compiled = re.compile(pattern)
+    except (re.error, TypeError, ValueError):
+        return ""
+
+    def fits(value: str) -> bool:
+        if len(value) < min_length:
+            return False
+        if max_length is not None and len(value) > max_length:
+            return False
+        return compiled.search(value) is not None
+
+    # Natural lengths first
+    for attempt in range(_PATTERN_ATTEMPTS):
+        value = "".join(_emit(parsed, random.Random(h + attempt), {}))
+        if fits(value):
+            return value
+
+    # Then aim at a length the pattern can produce within the bounds
+    cap = max_length if max_length is not None else min_length + _LENGTH_SLACK
+    lengths = _Lengths(cap)
+    targets = [
+        length
+        for length in _bits(lengths.sequence(parsed))
+        if length >= min_length
+    ]
+
+    for attempt in range(_PATTERN_ATTEMPTS if targets else 0):
+        rng = random.Random(h + attempt)
+        target = targets[rng.randrange(min(len(targets), _LENGTH_SLACK))]
+        value = "".join(lengths.emit_sequence(parsed, target, rng, {}))
+        if fits(value):
+            return value
+
+    raise ValueError(
+        f"No value of pattern {pattern!r} with length in "
+        f"[{min_length}, {max_length if max_length is not None else '...'}]"
+    )
+
+
+_PRINTABLE = string.ascii_letters + string.digits + "-_."
+
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: string.digits,
+    sre_parse.CATEGORY_NOT_DIGIT: string.ascii_letters,
+    sre_parse.CATEGORY_WORD: string.ascii_letters + string.digits + "_",
+    sre_parse.CATEGORY_NOT_WORD: "-.@ ",
+    sre_parse.CATEGORY_SPACE: " ",
+    sre_parse.CATEGORY_NOT_SPACE: string.ascii_letters + string.digits,
+}
+
+
+def _emit(parsed, rng: random.Random, groups: dict) -> List[str]:
+    out: List[str] = []
+
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            out.append(chr(arg))
+
+        elif op is sre_parse.NOT_LITERAL:
+            out.append(rng.choice([c for c in _PRINTABLE if ord(c) != arg]))
+
+        elif op is sre_parse.ANY:
+            out.append(rng.choice(_PRINTABLE))
+
+        elif op is sre_parse.IN:
+            out.append(_emit_in(arg, rng))
+
+        elif op is sre_parse.BRANCH:
+            out.extend(_emit(rng.choice(arg[1]), rng, groups))
+
+        elif op is sre_parse.SUBPATTERN:
+            group, _, _, sub = arg
+            text = "".join(_emit(sub, rng, groups))
+            if group is not None:
+                groups[group] = text
+            out.append(text)
+
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, sub = arg
+            if high is sre_parse.MAXREPEAT or high > low + _MAX_EXTRA_REPEAT:
+                high = low + _MAX_EXTRA_REPEAT
+            for _ in range(rng.randint(low, high)):
+                out.extend(_emit(sub, rng, groups))
+
+        elif op is sre_parse.GROUPREF:
+            out.append(groups.get(arg, ""))
+
+        elif op is sre_parse.CATEGORY:
+            out.append(rng.choice(_CATEGORIES.get(arg, _PRINTABLE)))
+
+        # AT (anchors), lookarounds and other zero-width items emit nothing
+
+    return out
+
+
+# --------------------------------------------------
+# Length-directed generation
+# (achievable lengths as bitsets: bit n set <=> length n possible)
+# --------------------------------------------------
+_SINGLE_CHAR = (
+    sre_parse.LITERAL,
+    sre_parse.NOT_LITERAL,
+    sre_parse.ANY,
+    sre_parse.IN,
+    sre_parse.CATEGORY,
+)
+
+
+def _bits(mask: int) -> List[int]:
+    return [n for n in range(mask.bit_length()) if mask >> n & 1]
+
+
+class _Lengths:
+    """
+    Lengths each parsed node can produce (up to cap), and emission of
+    a node at an exact length.
+    """
+
+    def __init__(self, cap: int):
+        self.cap = cap
+        self.mask = (1 << (cap + 1)) - 1
+        self._memo = {}
+
+    def _sum(self, a: int, b: int) -> int:
+        total = 0
+        for n in _bits(b):
+            total |= a << n
+        return total & self.mask
+
+    def sequence(self, items) -> int:
+        total = 1
+        for item in items:
+            total = self._sum(total, self.node(item))
+        return total
+
+    def node(self, item) -> int:
+        key = id(item)
+        if key not in self._memo:
+            self._memo[key] = self._node(*item)
+        return self._memo[key]
+
+    def _node(self, op, arg) -> int:
+        if op in _SINGLE_CHAR:
+            return 0b10
+
+        if op is sre_parse.BRANCH:
+            total = 0
+            for option in arg[1]:
+                total |= self.sequence(option)
+            return total
+
+        if op is sre_parse.SUBPATTERN:
+            return self.sequence(arg[3])
+
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, sub = arg
+            total = 0
+            for count, lengths in self._repeats(low, high, sub):
+                total |= lengths
+            return total
+
+        if op is sre_parse.GROUPREF:
+            # Length of a backreference is not known up front
+            return 0
+
+        # Anchors, lookarounds: zero width
+        return 1
+
+    def _repeats(self, low: int, high, sub):
+        """
+        Yields (count, lengths of count items) for the feasible counts.
+        """
+        item = self.sequence(sub)
+        high = self.cap + low if high is sre_parse.MAXREPEAT else high
+        current = 1
+        for count in range(high + 1):
+            if count >= low:
+                yield count, current
+            following = self._sum(current, item)
+            if following == 0 or (following == current and count >= low):
+                break
+            current = following
+
+    def emit_sequence(self, items, length: int, rng: random.Random, groups: dict) -> List[str]:
+        # suffix[i]: lengths of items[i:]
+        suffix = [1] * (len(items) + 1)
+        for index in range(len(items) - 1, -1, -1):
+            suffix[index] = self._sum(suffix[index + 1], self.node(items[index]))
+
+        out: List[str] = []
+        for index, item in enumerate(items):
+            choices = [
+                n for n in _bits(self.node(item))
+                if n <= length and suffix[index + 1] >> (length - n) & 1
+            ]
+            n = rng.choice(choices)
+            out.extend(self.emit_node(item, n, rng, groups))
+            length -= n
+        return out
+
+    def emit_node(self, item, length: int, rng: random.Random, groups: dict) -> List[str]:
+        op, arg = item
+
+        if op in _SINGLE_CHAR:
+            return _emit([item], rng, groups)
+
+        if op is sre_parse.BRANCH:
+            options = [option for option in arg[1] if self.sequence(option) >> length & 1]
+            return self.emit_sequence(rng.choice(options), length, rng, groups)
+
+        if op is sre_parse.SUBPATTERN:
+            group, _, _, sub = arg
+            text = "".join(self.emit_sequence(sub, length, rng, groups))
+            if group is not None:
+                groups[group] = text
+            return [text]
+
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, sub = arg
+            counts = [
+                count for count, lengths in self._repeats(low, high, sub)
+                if lengths >> length & 1
+            ]
+            count = rng.choice(counts)
+            return self.emit_sequence(list(sub) * count, length, rng, groups)
+
+        return []
+
+
+def _emit_in(items, rng: random.Random) -> str:
+    negate = bool(items) and items[0][0] is sre_parse.NEGATE
+    allowed = set()
+
+    for op, arg in items:
+        if op is sre_parse.LITERAL:
+            allowed.add(chr(arg))
+        elif op is sre_parse.RANGE:
+            allowed.update(chr(c) for c in range(arg[0], arg[1] + 1))
+        elif op is sre_parse.CATEGORY:
+            allowed.update(_CATEGORIES.get(arg, ""))
+
+    if negate:
+        choices = [c for c in _PRINTABLE if c not in allowed]
+    else:
+        choices = sorted(allowed)
+
+    return rng.choice(choices) if choices else ""
+
+
+# --------------------------------------------------
+# Validation
+# --------------------------------------------------
+def violations(value, schema, path: str) -> List[str]:
+    """
+    Constraint violations of a resolved value (recursively).
+    Missing / null values are left to the required-field check.
+    """
+    if value is None or not hasattr(schema, "get"):
+        return []
+
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        results = [violations(value, option, path) for option in options]
+        if not results or any(not result for result in results):
+            return []
+        return results[0]
+
+    errors: List[str] = []
+
+    enum_values = schema.get("enum")
+    if enum_values and value not in enum_values:
+        errors.append(f"{path}: {value!r} not in enum")
+
+    if isinstance(value, str):
+        errors.extend(_string_violations(value, schema, path))
+
+    elif _is_number(value):
+        errors.extend(_number_violations(value, schema, path))
+
+    elif isinstance(value, list):
+        if "minItems" in schema and len(value) < schema["minItems"]:
+            errors.append(f"{path}: fewer than {schema['minItems']} items")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append(f"{path}: more than {schema['maxItems']} items")
+
+        item_schema = schema.get("items")
+        if item_schema is not None:
+            for index, item in enumerate(value):
+                errors.extend(violations(item, item_schema, f"{path}[{index}]"))
+
+    elif isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for key, item in value.items():
+            if key in properties:
+                errors.extend(violations(item, properties[key], f"{path}.{key}"))
+
+    return errors
+
+
+def _string_violations(value: str, schema, path: str) -> List[str]:
+    errors = []
+
+    if "minLength" in schema and len(value) < schema["minLength"]:
+        errors.append(f"{path}: shorter than {schema['minLength']}")
+    if "maxLength" in schema and len(value) > schema["maxLength"]:
+        errors.append(f"{path}: longer than {schema['maxLength']}")
+
+    pattern = schema.get("pattern")
+    if pattern is not None:
+        try:
+            if not re.search(pattern, value):
+                errors.append(f"{path}: does not match {pattern!r}")
+        except re.error:
+            pass
+
+    checks = {"email": _EMAIL, "uri": _URI, "date": _DATE}
+    check = checks.get(schema.get("format"))
+    if check is not None and not check.match(value):
+        errors.append(f"{path}: not a valid {schema['format']}")
+
+    return errors
+
+
+def _number_violations(value, schema, path: str) -> List[str]:
+    errors = []
+
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+    exclusive_low = schema.get("exclusiveMinimum")
+    exclusive_high = schema.get("exclusiveMaximum")
+
+    if minimum is not None:
+        if value < minimum or (exclusive_low is True and value == minimum):
+            errors.append(f"{path}: below minimum {minimum}")
+    if maximum is not None:
+        if value > maximum or (exclusive_high is True and value == maximum):
+            errors.append(f"{path}: above maximum {maximum}")
+    if _is_number(exclusive_low) and value <= exclusive_low:
+        errors.append(f"{path}: not above {exclusive_low}")
+    if _is_number(exclusive_high) and value >= exclusive_high:
+        errors.append(f"{path}: not below {exclusive_high}")
+
+    step = schema.get("multipleOf")
+    if step:
+        quotient = value / step
+        if abs(quotient - round(quotient)) > 1e-9 * max(1.0, abs(quotient)):
+            errors.append(f"{path}: not a multiple of {step}")
+
+    return errors
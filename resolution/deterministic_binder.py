@@ -1,16 +1,16 @@
 # agent/resolution/deterministic_binder.py
 
-import random
 from .context import StepResolutionContext
 
 
 class DeterministicBinder:
     """
     Ensures deterministic behavior using provided seed.
+
+    Every generated value is derived from the test case id by the data
+    factory, so no stage draws random numbers and the global `random`
+    state is never seeded; resolutions can run concurrently.
     """
 
     def bind(self, context: StepResolutionContext) -> StepResolutionContext:
-        if context.deterministic_seed is not None:
-            random.seed(context.deterministic_seed)
-
         return context
@@ -1,5 +1,11 @@
 # agent/resolution/engine.py
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Union
+
+from agent.data_factory import COMPAT
+
 from .contracts import (
     TestStepResolutionRequest,
     ResolvedExecutionRequest,
@@ -10,28 +16,115 @@ from .dependency_resolver import DependencyResolver
 from .strategy_selector import DataStrategySelector
 from .deterministic_binder import DeterministicBinder
 from .field_resolver import FieldResolver
+from .payload_compiler import shared_compiler
 from .rbac_injector import RBACInjector
 from .validator import SchemaValidator
+from .resolution_cache import ResolutionCache
+from .instrumentation import StageObserver
 
 
 class TestDataResolutionEngine:
     """
     Orchestrates full resolution pipeline.
+
+    Stages keep no per-request state (everything lives on the
+    StepResolutionContext), so one engine may resolve from many threads.
+
+    With a ResolutionCache, requests resolved in a previous run (same
+    operation fingerprint and inputs) are returned from the cache.
+
+    Observers (see instrumentation.StageObserver) are notified around
+    every stage of every resolution, and of every cache hit.
+
+    hash_mode selects the data_factory hash of generated payloads
+    (COMPAT: historical values, FAST: cheaper, different values).
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ResolutionCache] = None,
+        observers: Optional[List[StageObserver]] = None,
+        hash_mode: str = COMPAT,
+    ):
+        self.cache = cache
+        self.observers = list(observers or [])
+        self.hash_mode = hash_mode
         self.schema_analyzer = SchemaAnalyzer()
         self.dependency_resolver = DependencyResolver()
         self.strategy_selector = DataStrategySelector()
         self.deterministic_binder = DeterministicBinder()
-        self.field_resolver = FieldResolver()
+        self.field_resolver = FieldResolver(shared_compiler(hash_mode))
         self.rbac_injector = RBACInjector()
         self.validator = SchemaValidator()
 
+        # Pipeline
+        self.stages = [
+            ("SchemaAnalyzer", self.schema_analyzer.analyze),
+            ("DependencyResolver", self.dependency_resolver.resolve),
+            ("DataStrategySelector", self.strategy_selector.select),
+            ("DeterministicBinder", self.deterministic_binder.bind),
+            ("FieldResolver", self.field_resolver.resolve),
+            ("RBACInjector", self.rbac_injector.inject),
+            ("SchemaValidator", self.validator.validate),
+        ]
+
+    def resolve_many(
+        self,
+        requests: Sequence[TestStepResolutionRequest],
+        return_exceptions: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List[Union[ResolvedExecutionRequest, Exception]]:
+        """
+        Resolves a batch of requests, in input order.
+
+        Each spec is analyzed once into an operation index shared by
+        all requests. With return_exceptions=True a failing request
+        yields its exception in place instead of aborting the batch.
+        With max_workers > 1 requests resolve on a thread pool; output
+        is the same as a serial run.
+        """
+        specs = {id(request.swagger_spec): request.swagger_spec for request in requests}
+        for swagger_spec in specs.values():
+            self.schema_analyzer.index(swagger_spec)
+
+        def resolve_one(request):
+            try:
+                return self.resolve(request)
+            except Exception as exception:
+                if not return_exceptions:
+                    raise
+                return exception
+
+        if max_workers and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(resolve_one, requests))
+        else:
+            results = [resolve_one(request) for request in requests]
+
+        if self.cache is not None:
+            self.cache.flush()
+
+        return results
+
     def resolve(
         self, request: TestStepResolutionRequest
     ) -> ResolvedExecutionRequest:
 
+        cache_key = None
+        if self.cache is not None:
+            lookup_started = time.perf_counter()
+            fingerprint = self.schema_analyzer.fingerprint(
+                request.swagger_spec, request.endpoint, request.http_method
+            )
+            cache_key = self.cache.key(fingerprint, request, self.hash_mode)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                # No stage runs: observers see the hit as its own event
+                elapsed = time.perf_counter() - lookup_started
+                for observer in self.observers:
+                    observer.on_cache_hit(request, elapsed)
+                return cached
+
         context = StepResolutionContext(
             endpoint=request.endpoint,
             http_method=request.http_method,
@@ -43,16 +136,13 @@ class TestDataResolutionEngine:
             request_content_type= request.request_content_type,
         )
 
-        # Pipeline
-        context = self.schema_analyzer.analyze(context)
-        context = self.dependency_resolver.resolve(context)
-        context = self.strategy_selector.select(context)
-        context = self.deterministic_binder.bind(context)
-        context = self.field_resolver.resolve(context)
-        context = self.rbac_injector.inject(context)
-        context = self.validator.validate(context)
-        print(f"request_content_type: {context.request_content_type}")
-        return ResolvedExecutionRequest(
+        if self.observers:
+            context = self._run_observed(context)
+        else:
+            for _, stage in self.stages:
+                context = stage(context)
+
+        resolved = ResolvedExecutionRequest(
             url=context.endpoint,
             http_method=context.http_method,
             path_params=context.resolved_path_params,
@@ -65,3 +155,41 @@ class TestDataResolutionEngine:
                 "intent": context.intent_metadata,
             },
         )
+
+        # Clock-dependent output is only reusable under a frozen clock
+        if cache_key is not None and (
+            self.cache.cache_time_dependent
+            or not self.field_resolver.uses_clock(context)
+        ):
+            self.cache.put(cache_key, resolved)
+
+        return resolved
+
+    def _run_observed(self, context: StepResolutionContext) -> StepResolutionContext:
+        for observer in self.observers:
+            observer.on_resolution_start(context)
+
+        started = time.perf_counter()
+        error = None
+
+        try:
+            for name, stage in self.stages:
+                for observer in self.observers:
+                    observer.on_stage_start(name, context)
+
+                stage_started = time.perf_counter()
+                try:
+                    context = stage(context)
+                finally:
+                    elapsed = time.perf_counter() - stage_started
+                    for observer in self.observers:
+                        observer.on_stage_end(name, context, elapsed)
+        except Exception as exception:
+            error = exception
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            for observer in self.observers:
+                observer.on_resolution_end(context, elapsed, error)
+
+        return context
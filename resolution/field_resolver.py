@@ -2,14 +2,16 @@
 import os
 from typing import Any, Dict
 from .context import StepResolutionContext
+from .payload_compiler import PayloadCompiler, payload_compiler
 from agent.data_factory import deterministic_value
-import uuid
-from datetime import datetime
 class FieldResolver:
     """
     Builds resolved request payload using strategy map.
     """
 
+    def __init__(self, compiler: PayloadCompiler = payload_compiler):
+        self.compiler = compiler
+
     def resolve(self, context: StepResolutionContext) -> StepResolutionContext:
         properties = context.request_schema.get("properties", {})
 
@@ -53,48 +55,16 @@ class FieldResolver:
 
         return context
 
-    def _generate_value(self, schema: Dict[str, Any], tc_id: str, field_name: str) -> Any:
-
-        # -------------------------
-        # Normalize anyOf
-        # -------------------------
-        if "anyOf" in schema:
-            for option in schema["anyOf"]:
-                if option.get("type") != "null":
-                    schema = option
-                    break
-
-        schema_type = schema.get("type", "string")
-        schema_format = schema.get("format")
-
-        # -------------------------
-        # Format-aware generation
-        # -------------------------
-        if schema_format == "uuid":
-            namespace = uuid.NAMESPACE_DNS
-            return str(uuid.uuid5(namespace, f"{tc_id}-{field_name}"))
-
-        if schema_format == "date-time":
-            return datetime.utcnow().isoformat()
-
-        # -------------------------
-        # Object
-        # -------------------------
-        if schema_type == "object":
-            properties = schema.get("properties", {})
-            return {
-                key: self._generate_value(value_schema, tc_id, key)
-                for key, value_schema in properties.items()
-            }
-
-        # -------------------------
-        # Array
-        # -------------------------
-        if schema_type == "array":
-            item_schema = schema.get("items", {})
-            return [self._generate_value(item_schema, tc_id, field_name)]
+    def uses_clock(self, context: StepResolutionContext) -> bool:
+        """
+        True when a generated field reads the current time (date-time).
+        """
+        properties = context.request_schema.get("properties", {})
+        return any(
+            self.compiler.compile(schema).uses_clock
+            for schema in properties.values()
+        )
 
-        # -------------------------
-        # Default primitive
-        # -------------------------
-        return deterministic_value(tc_id, field_name, schema_type)
+    def _generate_value(self, schema: Dict[str, Any], tc_id: str, field_name: str) -> Any:
+        # Compiled once per schema node, shared by every operation using it
+        return self.compiler.compile(schema)(tc_id, field_name)
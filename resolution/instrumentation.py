@@ -0,0 +1,196 @@
+# agent/resolution/instrumentation.py
+
+import threading
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from agent.latency_profile import summarize
+from .context import StepResolutionContext
+
+
+class StageObserver:
+    """
+    Hook surface of the resolution pipeline.
+    Subclasses override the hooks they need; all default to no-ops.
+    """
+
+    def on_resolution_start(self, context: StepResolutionContext):
+        pass
+
+    def on_stage_start(self, stage: str, context: StepResolutionContext):
+        pass
+
+    def on_stage_end(self, stage: str, context: StepResolutionContext, elapsed: float):
+        pass
+
+    def on_resolution_end(
+        self,
+        context: StepResolutionContext,
+        elapsed: float,
+        error: Optional[Exception] = None,
+    ):
+        pass
+
+    def on_cache_hit(self, request, elapsed: float):
+        """
+        A request answered from the ResolutionCache (no stage ran).
+        """
+        pass
+
+
+def count_fields(value: Any) -> int:
+    """
+    Number of leaf values in a resolved payload.
+    """
+    if isinstance(value, dict):
+        return sum(count_fields(item) for item in value.values())
+    if isinstance(value, list):
+        return sum(count_fields(item) for item in value)
+    return 1
+
+
+def operation_key(context) -> str:
+    # Works for a StepResolutionContext and a TestStepResolutionRequest
+    return f"{context.http_method.upper()} {context.endpoint}"
+
+
+class StageProfiler(StageObserver):
+    """
+    Records wall time, field counts and (optionally) allocations
+    per stage and per endpoint.
+
+    Allocation tracking uses tracemalloc, which is process-wide:
+    numbers are only meaningful when resolutions run serially.
+    If the profiler started tracing, close() stops it.
+    """
+
+    def __init__(self, trace_allocations: bool = False):
+        self.trace_allocations = trace_allocations
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        self._stage_ms: Dict[str, List[float]] = defaultdict(list)
+        self._stage_bytes: Dict[str, int] = defaultdict(int)
+        self._endpoints: Dict[str, dict] = {}
+        self._cache_hits = 0
+
+        self._started_tracing = False
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def close(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    # --------------------------------------------------
+    # Hooks
+    # --------------------------------------------------
+    def on_resolution_start(self, context):
+        self._local.stages = {}
+
+    def on_stage_start(self, stage, context):
+        if self.trace_allocations:
+            self._local.allocated = tracemalloc.get_traced_memory()[0]
+
+    def on_stage_end(self, stage, context, elapsed):
+        allocated = 0
+        if self.trace_allocations:
+            allocated = max(0, tracemalloc.get_traced_memory()[0] - self._local.allocated)
+
+        self._local.stages[stage] = elapsed * 1000
+
+        with self._lock:
+            self._stage_ms[stage].append(elapsed * 1000)
+            self._stage_bytes[stage] += allocated
+
+    def on_resolution_end(self, context, elapsed, error=None):
+        key = operation_key(context)
+        stages = getattr(self._local, "stages", {})
+
+        with self._lock:
+            entry = self._entry(key)
+            entry["resolutions"] += 1
+            entry["errors"] += error is not None
+            entry["total_ms"] += elapsed * 1000
+            entry["schema_fields"] = len(context.request_schema.get("properties", {}))
+            entry["resolved_fields"] = count_fields(context.resolved_body)
+            for stage, elapsed_ms in stages.items():
+                entry["stages_ms"][stage] += elapsed_ms
+
+    def on_cache_hit(self, request, elapsed):
+        with self._lock:
+            self._cache_hits += 1
+            self._entry(operation_key(request))["cache_hits"] += 1
+
+    def _entry(self, key: str) -> dict:
+        return self._endpoints.setdefault(
+            key,
+            {
+                "endpoint": key,
+                "resolutions": 0,
+                "cache_hits": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "schema_fields": 0,
+                "resolved_fields": 0,
+                "stages_ms": defaultdict(float),
+            },
+        )
+
+    # --------------------------------------------------
+    # Report
+    # --------------------------------------------------
+    def summary(self, top: int = 10) -> Dict:
+        with self._lock:
+            stages = []
+            for stage, values in self._stage_ms.items():
+                row = {"stage": stage, "total_ms": round(sum(values), 3)}
+                row.update(summarize(values))
+                if self.trace_allocations:
+                    row["allocated_kib"] = round(self._stage_bytes[stage] / 1024, 1)
+                stages.append(row)
+
+            endpoints = []
+            for entry in self._endpoints.values():
+                stages_ms = entry["stages_ms"]
+                endpoints.append(
+                    {
+                        **entry,
+                        "total_ms": round(entry["total_ms"], 3),
+                        "mean_ms": round(entry["total_ms"] / max(1, entry["resolutions"]), 3),
+                        "slowest_stage": max(stages_ms, key=stages_ms.get) if stages_ms else None,
+                        "stages_ms": {k: round(v, 3) for k, v in stages_ms.items()},
+                    }
+                )
+
+            cache_hits = self._cache_hits
+
+        stages.sort(key=lambda row: row["total_ms"], reverse=True)
+        endpoints.sort(key=lambda row: row["total_ms"], reverse=True)
+
+        return {"stages": stages, "slowest_endpoints": endpoints[:top], "cache_hits": cache_hits}
+
+    def print_summary(self, top: int = 10):
+        report = self.summary(top)
+
+        print("Resolution stages (slowest first):")
+        for row in report["stages"]:
+            line = (
+                f"  {row['stage']:<22} total={row['total_ms']:.1f}ms "
+                f"p50={row['p50_ms']:.3f}ms p95={row['p95_ms']:.3f}ms"
+            )
+            if "allocated_kib" in row:
+                line += f" alloc={row['allocated_kib']}KiB"
+            print(line)
+
+        print(f"Slowest endpoints (top {top}):")
+        for row in report["slowest_endpoints"]:
+            print(
+                f"  {row['endpoint']:<40} total={row['total_ms']:.1f}ms "
+                f"fields={row['resolved_fields']} slowest={row['slowest_stage']}"
+            )
+
+        print(f"Cache hits: {report['cache_hits']}")
@@ -0,0 +1,224 @@
+# agent/resolution/payload_compiler.py
+
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable
+
+from agent.data_factory import COMPAT, FAST, deterministic_values, value_generator
+from .constraints import constrained_builder, has_constraints
+from .ref_table import RECURSIVE_REF
+
+# builder(tc_id, field_name) -> value
+# builder.uses_clock tells whether its output depends on the current time
+PayloadBuilder = Callable[[str, str], Any]
+
+
+class PayloadCompiler:
+    """
+    Compiles a schema into a tree of closures once; the closures are then
+    run per test case id.
+
+    Builders are cached by schema node identity, so every operation that
+    reads the same (shared) component view reuses the same builder.
+
+    hash_mode selects the data_factory hash (COMPAT keeps the
+    historical values).
+    """
+
+    def __init__(self, max_entries: int = 4096, hash_mode: str = COMPAT):
+        self.max_entries = max_entries
+        self.hash_mode = hash_mode
+        self._builders: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def compile(self, schema) -> PayloadBuilder:
+        key = id(schema)
+
+        with self._lock:
+            cached = self._builders.get(key)
+            # The node is held by the cache, so its id cannot be reused
+            if cached is not None and cached[0] is schema:
+                self._builders.move_to_end(key)
+                return cached[1]
+
+            builder = self._build(schema)
+            self._builders[key] = (schema, builder)
+            while len(self._builders) > self.max_entries:
+                self._builders.popitem(last=False)
+            return builder
+
+    # --------------------------------------------------
+    # Compilation (same rules as FieldResolver._generate_value)
+    # --------------------------------------------------
+    def _build(self, schema) -> PayloadBuilder:
+
+        # Normalize anyOf
+        if "anyOf" in schema:
+            for option in schema["anyOf"]:
+                if option.get("type") != "null":
+                    schema = option
+                    break
+
+        # Bounded self-reference: stop recursing
+        if schema.get(RECURSIVE_REF):
+            return _none
+
+        schema_type = schema.get("type", "string")
+        schema_format = schema.get("format")
+
+        if schema_format == "uuid":
+            return _uuid
+
+        if schema_format == "date-time":
+            return _date_time
+
+        if schema_type == "object":
+            fields = [
+                (key, self.compile(value_schema))
+                for key, value_schema in schema.get("properties", {}).items()
+            ]
+            return _object_builder(fields, self.hash_mode)
+
+        if schema_type == "array":
+            item_schema = schema.get("items", {})
+            if item_schema.get(RECURSIVE_REF) or schema.get("maxItems") == 0:
+                return _empty_list
+
+            build_item = self.compile(item_schema)
+            min_items = schema.get("minItems", 1)
+
+            if min_items <= 1:
+                def build_array(tc_id, field_name):
+                    return [build_item(tc_id, field_name)]
+            else:
+                # Extra items vary by test case id so they stay distinct
+                def build_array(tc_id, field_name):
+                    return [build_item(tc_id, field_name)] + [
+                        build_item(f"{tc_id}#{index}", field_name)
+                        for index in range(1, min_items)
+                    ]
+
+            build_array.uses_clock = build_item.uses_clock
+            return build_array
+
+        # minLength / pattern / minimum / multipleOf / email ...
+        if has_constraints(schema):
+            builder = constrained_builder(schema, schema_type, self.hash_mode)
+            builder.uses_clock = False
+            return builder
+
+        return _primitive(schema_type, self.hash_mode)
+
+
+class PlainPayloadCompiler(PayloadCompiler):
+    """
+    Type-only dialect used by the schema-based fallback builder:
+    no anyOf / format handling and no default type.
+    """
+
+    def _build(self, schema) -> PayloadBuilder:
+        if not schema:
+            return _none
+
+        schema_type = schema.get("type")
+
+        if schema_type == "object":
+            fields = [
+                (key, self.compile(value_schema))
+                for key, value_schema in schema.get("properties", {}).items()
+            ]
+            return _object_builder(fields, self.hash_mode)
+
+        if schema_type == "array":
+            build_item = self.compile(schema.get("items", {}))
+
+            def build_array(tc_id, field_name):
+                return [build_item(tc_id, field_name)]
+
+            build_array.uses_clock = build_item.uses_clock
+            return build_array
+
+        return _primitive(schema_type, self.hash_mode)
+
+
+# --------------------------------------------------
+# Leaf builders
+# --------------------------------------------------
+def _none(tc_id, field_name):
+    return None
+
+
+def _empty_list(tc_id, field_name):
+    return []
+
+
+def _uuid(tc_id, field_name):
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{tc_id}-{field_name}"))
+
+
+def _date_time(tc_id, field_name):
+    return datetime.utcnow().isoformat()
+
+
+def _primitive(schema_type, hash_mode) -> PayloadBuilder:
+    build_primitive = value_generator(schema_type, hash_mode)
+    build_primitive.uses_clock = False
+    build_primitive.primitive_type = schema_type
+    return build_primitive
+
+
+def _object_builder(fields, hash_mode) -> PayloadBuilder:
+    # Plain primitive fields are generated in one deterministic_values batch
+    plain = [(key, build.primitive_type) for key, build in fields if hasattr(build, "primitive_type")]
+    plain_keys = [key for key, _ in plain]
+    nested = [(key, build) for key, build in fields if not hasattr(build, "primitive_type")]
+    order = [key for key, _ in fields]
+
+    def build_object(tc_id, field_name):
+        values = dict(zip(
+            plain_keys,
+            deterministic_values([(tc_id, key, type_name) for key, type_name in plain], hash_mode),
+        ))
+        if not nested:
+            return values
+        for key, build in nested:
+            values[key] = build(tc_id, key)
+        return {key: values[key] for key in order}
+
+    build_object.uses_clock = any(build.uses_clock for _, build in fields)
+    return build_object
+
+
+_none.uses_clock = False
+_empty_list.uses_clock = False
+_uuid.uses_clock = False
+_date_time.uses_clock = True
+
+
+# Shared compilers, one per hash mode
+payload_compiler = PayloadCompiler()
+plain_payload_compiler = PlainPayloadCompiler()
+
+_compilers = {
+    (PayloadCompiler, COMPAT): payload_compiler,
+    (PlainPayloadCompiler, COMPAT): plain_payload_compiler,
+}
+_compilers_lock = threading.Lock()
+
+
+def shared_compiler(hash_mode: str = COMPAT, plain: bool = False) -> PayloadCompiler:
+    """
+    The shared (plain) compiler of a hash mode.
+    """
+    if hash_mode not in (COMPAT, FAST):
+        raise ValueError(f"Unknown hash mode: {hash_mode}")
+
+    compiler_class = PlainPayloadCompiler if plain else PayloadCompiler
+    with _compilers_lock:
+        compiler = _compilers.get((compiler_class, hash_mode))
+        if compiler is None:
+            compiler = compiler_class(hash_mode=hash_mode)
+            _compilers[(compiler_class, hash_mode)] = compiler
+        return compiler
@@ -0,0 +1,94 @@
+# agent/resolution/ref_table.py
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Set, Tuple
+
+# Marker left where a schema refers back to a component being expanded
+RECURSIVE_REF = "x-recursive"
+
+
+class RefTable:
+    """
+    Per-spec table of resolved $ref targets.
+
+    Every #/components/... target is looked up once, and the set of
+    $refs reachable from it is computed once (schema views use it to
+    share component views between operations).
+    """
+
+    _tables: "OrderedDict[int, Tuple[dict, RefTable]]" = OrderedDict()
+    _tables_lock = threading.Lock()
+    _max_tables = 8
+
+    def __init__(self, swagger_spec: dict):
+        self.swagger_spec = swagger_spec
+        self._targets: Dict[str, Any] = {}
+        self._refs: Dict[str, Set[str]] = {}
+        self._reachable: Dict[str, FrozenSet[str]] = {}
+
+    @classmethod
+    def for_spec(cls, swagger_spec: dict) -> "RefTable":
+        """
+        Returns the shared table for this spec object.
+        """
+        key = id(swagger_spec)
+
+        with cls._tables_lock:
+            cached = cls._tables.get(key)
+            # The spec is held by the cache, so its id cannot be reused
+            if cached is not None and cached[0] is swagger_spec:
+                cls._tables.move_to_end(key)
+                return cached[1]
+
+            table = cls(swagger_spec)
+            cls._tables[key] = (swagger_spec, table)
+            while len(cls._tables) > cls._max_tables:
+                cls._tables.popitem(last=False)
+            return table
+
+    def resolve(self, ref_path: str):
+        """
+        Resolves local $ref like #/components/schemas/XYZ
+        """
+        target = self._targets.get(ref_path)
+        if target is None:
+            parts = ref_path.strip("#/").split("/")
+            target = self.swagger_spec
+            for part in parts:
+                target = target.get(part, {})
+            self._targets[ref_path] = target
+        return target
+
+    def reachable(self, ref_path: str) -> FrozenSet[str]:
+        """
+        Every $ref reachable from the target of ref_path (transitively).
+        """
+        closure = self._reachable.get(ref_path)
+        if closure is None:
+            seen = set()
+            pending = list(self._direct_refs(ref_path))
+            while pending:
+                ref = pending.pop()
+                if ref not in seen:
+                    seen.add(ref)
+                    pending.extend(self._direct_refs(ref) - seen)
+            closure = frozenset(seen)
+            self._reachable[ref_path] = closure
+        return closure
+
+    def _direct_refs(self, ref_path: str) -> Set[str]:
+        refs = self._refs.get(ref_path)
+        if refs is None:
+            refs = set()
+            pending = [self.resolve(ref_path)]
+            while pending:
+                node = pending.pop()
+                if isinstance(node, dict):
+                    if isinstance(node.get("$ref"), str):
+                        refs.add(node["$ref"])
+                    pending.extend(node.values())
+                elif isinstance(node, list):
+                    pending.extend(node)
+            self._refs[ref_path] = refs
+        return refs
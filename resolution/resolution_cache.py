@@ -0,0 +1,177 @@
+# agent/resolution/resolution_cache.py
+
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .contracts import TestStepResolutionRequest, ResolvedExecutionRequest
+
+# Bump when resolution output changes for the same inputs
+CACHE_SCHEMA_VERSION = 3
+
+
+class ResolutionCache:
+    """
+    Persistent SQLite cache of resolved requests.
+
+    Entries are keyed by a canonical hash of everything a resolution
+    depends on (operation fingerprint, method, seed, intent metadata,
+    role / execution context). The file is kept under max_bytes by
+    evicting the least recently used entries.
+
+    Results that read the clock (date-time fields) are only stored
+    when cache_time_dependent is set, i.e. when the caller runs with a
+    frozen clock.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        cache_time_dependent: bool = False,
+        commit_every: int = 256,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.cache_time_dependent = cache_time_dependent
+        self.commit_every = commit_every
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resolutions (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS resolutions_lru ON resolutions (last_used)"
+        )
+        self._db.commit()
+
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM resolutions"
+        ).fetchone()[0]
+
+        # The limit may have been lowered since the last run
+        self._evict()
+        self._db.commit()
+
+    # --------------------------------------------------
+    # Keys
+    # --------------------------------------------------
+    @staticmethod
+    def key(fingerprint: str, request: TestStepResolutionRequest, hash_mode: str = "compat") -> str:
+        canonical = json.dumps(
+            {
+                "version": CACHE_SCHEMA_VERSION,
+                "fingerprint": fingerprint,
+                "endpoint": request.endpoint,
+                "method": request.http_method.upper(),
+                "seed": request.deterministic_seed,
+                "intent": request.intent_metadata,
+                "role": request.role_context,
+                "execution": request.execution_context,
+                "content_type": request.request_content_type,
+                "hash_mode": hash_mode,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    # --------------------------------------------------
+    # Lookup / Store
+    # --------------------------------------------------
+    def get(self, key: str) -> Optional[ResolvedExecutionRequest]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM resolutions WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._db.execute(
+                "UPDATE resolutions SET last_used = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._written()
+
+        return ResolvedExecutionRequest(**json.loads(row[0]))
+
+    def put(self, key: str, resolved: ResolvedExecutionRequest):
+        value = json.dumps(dataclasses.asdict(resolved), default=str)
+        size = len(key) + len(value)
+
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT size FROM resolutions WHERE key = ?", (key,)
+            ).fetchone()
+            if previous is not None:
+                self._total_bytes -= previous[0]
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO resolutions (key, value, size, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._total_bytes += size
+
+            self._evict()
+            self._written()
+
+    # --------------------------------------------------
+    # Maintenance
+    # --------------------------------------------------
+    def _evict(self):
+        while self._total_bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM resolutions ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+
+            for key, size in rows:
+                self._db.execute("DELETE FROM resolutions WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    return
+
+    def _written(self):
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._db.commit()
+            self._pending = 0
+
+    def flush(self):
+        with self._lock:
+            self._db.commit()
+            self._pending = 0
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
@@ -1,43 +1,168 @@
 # agent/resolution/schema_analyzer.py
 
-from typing import Dict, Any
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple
+from agent.swagger_reader import OperationFingerprinter
 from .context import StepResolutionContext
+from .ref_table import RefTable
+from .schema_view import SchemaView, component_view
+
+
+@dataclass
+class OperationSchema:
+    """
+    Request schema information of one operation, analyzed once per spec.
+    """
+
+    request_content_type: Optional[str]
+    request_schema: Any
+    required_fields: list
+    path_params_schema: Dict[str, Any] = field(default_factory=dict)
+    query_params_schema: Dict[str, Any] = field(default_factory=dict)
+    fingerprint: Optional[str] = None
+
+
+class SpecIndex:
+    """
+    Per-spec state of a SchemaAnalyzer: the shared $ref table, component
+    views, analyzed operations and the operation fingerprinter.
+    """
+
+    def __init__(self, swagger_spec: dict):
+        self.ref_table = RefTable.for_spec(swagger_spec)
+        self.views: Dict[Tuple[str, FrozenSet[str]], SchemaView] = {}
+        self.operations: Dict[Tuple[str, str], OperationSchema] = {}
+        self.fingerprinter: Optional[OperationFingerprinter] = None
 
 
 class SchemaAnalyzer:
     """
     Extracts request schema information from OpenAPI spec.
+    Operations are analyzed once per spec and analyzer.
     """
 
+    max_specs = 8
+
+    def __init__(self):
+        self._indexes: "OrderedDict[int, Tuple[dict, SpecIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def spec_index(self, swagger_spec: dict) -> SpecIndex:
+        key = id(swagger_spec)
+
+        with self._lock:
+            cached = self._indexes.get(key)
+            # The spec is held here, so its id cannot be reused
+            if cached is not None and cached[0] is swagger_spec:
+                self._indexes.move_to_end(key)
+                return cached[1]
+
+            spec_index = SpecIndex(swagger_spec)
+            self._indexes[key] = (swagger_spec, spec_index)
+            while len(self._indexes) > self.max_specs:
+                self._indexes.popitem(last=False)
+            return spec_index
+
     def analyze(self, context: StepResolutionContext) -> StepResolutionContext:
-        paths = context.swagger_spec.get("paths", {})
-        endpoint_spec = paths.get(context.endpoint, {})
-        method_spec = endpoint_spec.get(context.http_method.lower(), {})
+        operation = self.describe(
+            context.swagger_spec,
+            context.endpoint,
+            context.http_method,
+        )
+
+        context.request_content_type = operation.request_content_type
+        context.request_schema = operation.request_schema
+        context.required_fields = operation.required_fields
+        context.path_params_schema.update(operation.path_params_schema)
+        context.query_params_schema.update(operation.query_params_schema)
+
+        return context
+
+    # --------------------------------------------------
+    # Operation index
+    # --------------------------------------------------
+    def index(self, swagger_spec: dict) -> Dict[Tuple[str, str], OperationSchema]:
+        """
+        Analyzes every operation of the spec up front.
+        """
+        for path, path_item in swagger_spec.get("paths", {}).items():
+            for method, method_spec in path_item.items():
+                if isinstance(method_spec, dict):
+                    self.describe(swagger_spec, path, method)
+
+        return self.spec_index(swagger_spec).operations
+
+    def describe(self, swagger_spec: dict, endpoint: str, http_method: str) -> OperationSchema:
+        """
+        Returns the (memoized) analysis of one operation.
+        """
+        spec_index = self.spec_index(swagger_spec)
+        key = (endpoint, http_method.lower())
+
+        operation = spec_index.operations.get(key)
+        if operation is None:
+            operation = self._analyze_operation(spec_index, *key)
+            spec_index.operations[key] = operation
+        return operation
+
+    def fingerprint(self, swagger_spec: dict, endpoint: str, http_method: str) -> str:
+        """
+        Spec fingerprint of one operation and every component it references.
+        """
+        operation = self.describe(swagger_spec, endpoint, http_method)
+
+        if operation.fingerprint is None:
+            spec_index = self.spec_index(swagger_spec)
+            if spec_index.fingerprinter is None:
+                spec_index.fingerprinter = OperationFingerprinter(swagger_spec)
+
+            path_item = swagger_spec.get("paths", {}).get(endpoint, {})
+            operation.fingerprint = spec_index.fingerprinter.fingerprint(
+                http_method,
+                endpoint,
+                path_item.get("parameters", []),
+                path_item.get(http_method.lower(), {}),
+            )
+
+        return operation.fingerprint
+
+    def _analyze_operation(self, spec_index: SpecIndex, endpoint: str, http_method: str) -> OperationSchema:
+        ref_table = spec_index.ref_table
+        paths = ref_table.swagger_spec.get("paths", {})
+        endpoint_spec = paths.get(endpoint, {})
+        method_spec = endpoint_spec.get(http_method, {})
 
         request_body = method_spec.get("requestBody", {})
         content = request_body.get("content", {})
 
         if "application/json" in content:
             json_schema = content["application/json"].get("schema", {})
-            context.request_content_type = "application/json"
+            content_type = "application/json"
 
         elif "application/x-www-form-urlencoded" in content:
             json_schema = content["application/x-www-form-urlencoded"].get("schema", {})
-            
-            context.request_content_type = "application/x-www-form-urlencoded"
+            content_type = "application/x-www-form-urlencoded"
 
         else:
             json_schema = {}
-            context.request_content_type = None
+            content_type = None
 
-        # Resolve $ref if present
+        # Lazy view over the shared per-spec $ref table;
+        # nested $ref resolve only when a stage reads them
         if "$ref" in json_schema:
-            ref_path = json_schema["$ref"]
-            json_schema = self._resolve_ref(ref_path, context.swagger_spec)
+            request_schema = component_view(ref_table, json_schema["$ref"], spec_index.views)
+            json_schema = ref_table.resolve(json_schema["$ref"])
+        else:
+            request_schema = SchemaView(json_schema, ref_table)
+
+        operation = OperationSchema(
+            request_content_type=content_type,
+            request_schema=request_schema,
+            required_fields=json_schema.get("required", []),
+        )
 
-        context.request_schema = self._resolve_nested_refs(json_schema, context.swagger_spec)
-        context.required_fields = json_schema.get("required", [])
-       
         parameters = method_spec.get("parameters", [])
 
         for param in parameters:
@@ -46,60 +171,8 @@ class SchemaAnalyzer:
             schema = param.get("schema", {})
 
             if location == "path":
-                context.path_params_schema[name] = schema
+                operation.path_params_schema[name] = schema
             elif location == "query":
-                context.query_params_schema[name] = schema
-
-        return context
-
-
-    def _resolve_ref(self, ref_path: str, swagger_spec: dict):
-        """
-        Resolves local $ref like #/components/schemas/XYZ
-        """
-        parts = ref_path.strip("#/").split("/")
-        node = swagger_spec
-        for part in parts:
-            node = node.get(part, {})
-        return node
-
-    def _resolve_nested_refs(self, schema: dict, swagger_spec: dict):
-        """
-        Recursively resolve $ref inside schema.
-        """
+                operation.query_params_schema[name] = schema
 
-        if not isinstance(schema, dict):
-            return schema
-
-        # Resolve direct $ref
-        if "$ref" in schema:
-            resolved = self._resolve_ref(schema["$ref"], swagger_spec)
-            return self._resolve_nested_refs(resolved, swagger_spec)
-
-        # Resolve anyOf
-        if "anyOf" in schema:
-            return {
-                "anyOf": [
-                    self._resolve_nested_refs(option, swagger_spec)
-                    for option in schema["anyOf"]
-                ]
-            }
-
-        # Resolve properties recursively
-        if "properties" in schema:
-            return {
-                **schema,
-                "properties": {
-                    key: self._resolve_nested_refs(value, swagger_spec)
-                    for key, value in schema["properties"].items()
-                },
-            }
-
-        # Resolve array items
-        if "items" in schema:
-            return {
-                **schema,
-                "items": self._resolve_nested_refs(schema["items"], swagger_spec),
-            }
-
-        return schema
+        return operation
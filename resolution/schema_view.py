@@ -0,0 +1,197 @@
+# agent/resolution/schema_view.py
+
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Tuple
+
+from .ref_table import RECURSIVE_REF, RefTable
+
+
+class SchemaView(Mapping):
+    """
+    Read-only, lazily expanded view of a schema node.
+
+    Behaves like the eagerly expanded schema (same keys, same values) but
+    a $ref is only resolved when the node is read, and child views are
+    built on first access and cached on the node. No schema is copied.
+
+    With a views table (one per spec), nested $refs resolve to the
+    shared view of their component, so every DTO that embeds the same
+    component reads the same view.
+    """
+
+    __slots__ = ("_node", "_table", "_stack", "_views", "_state", "_children")
+
+    def __init__(
+        self,
+        node: dict,
+        table: RefTable,
+        stack: Tuple[str, ...] = (),
+        views: Optional[Dict[Tuple[str, FrozenSet[str]], "SchemaView"]] = None,
+    ):
+        self._node = node
+        self._table = table
+        self._stack = stack
+        self._views = views
+        self._state = None
+        self._children = {}
+
+    # --------------------------------------------------
+    # Lazy resolution
+    # --------------------------------------------------
+    def _resolved(self) -> Tuple[dict, Tuple[str, ...], Tuple[str, ...]]:
+        """
+        (target, keys, stack) of the node. Computed into locals and
+        published in one assignment, so a concurrent reader sees either
+        nothing or the complete state.
+        """
+        state = self._state
+        if state is None:
+            node = self._node
+            stack = self._stack
+
+            # Follow $ref chains; siblings of $ref are ignored
+            while isinstance(node, dict) and "$ref" in node:
+                ref_path = node["$ref"]
+                if ref_path in stack:
+                    node = {"$ref": ref_path, RECURSIVE_REF: True}
+                    break
+                stack = stack + (ref_path,)
+                node = self._table.resolve(ref_path)
+
+            target = node if isinstance(node, dict) else {}
+
+            # An anyOf node exposes only its (expanded) options
+            if "anyOf" in target and not target.get(RECURSIVE_REF):
+                keys = ("anyOf",)
+            else:
+                keys = tuple(target)
+
+            state = self._state = (target, keys, stack)
+        return state
+
+    def _child(self, node):
+        if not isinstance(node, dict):
+            return node
+        stack = self._resolved()[2]
+        if "$ref" in node:
+            if node["$ref"] in stack:
+                return {"$ref": node["$ref"], RECURSIVE_REF: True}
+            if self._views is not None:
+                return _shared_view(self._table, node["$ref"], stack, self._views)
+        return SchemaView(node, self._table, stack, self._views)
+
+    # --------------------------------------------------
+    # Mapping protocol
+    # --------------------------------------------------
+    def __getitem__(self, key: str) -> Any:
+        if key in self._children:
+            return self._children[key]
+
+        target, keys, _ = self._resolved()
+        if key not in keys:
+            raise KeyError(key)
+
+        if key == "anyOf":
+            value = [self._child(option) for option in target["anyOf"]]
+        elif key == "properties":
+            value = _PropertiesView(self, target["properties"])
+        elif key == "items" and "properties" not in target:
+            value = self._child(target["items"])
+        else:
+            # Plain keywords (type, enum, format, required...) are returned as is
+            return target[key]
+
+        self._children[key] = value
+        return value
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key) -> bool:
+        return key in self._resolved()[1]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._resolved()[1])
+
+    def __len__(self) -> int:
+        return len(self._resolved()[1])
+
+    def __repr__(self) -> str:
+        return f"SchemaView({self._node!r})"
+
+    def to_dict(self) -> dict:
+        """
+        Materializes the full expansion (for serialization / debugging).
+        """
+        return {key: _materialize(value) for key, value in self.items()}
+
+
+def component_view(
+    table: RefTable,
+    ref_path: str,
+    views: Optional[Dict[Tuple[str, FrozenSet[str]], SchemaView]] = None,
+) -> SchemaView:
+    """
+    Lazy view of a component. With a views dict (one per spec), every
+    operation that uses the same DTO, directly or nested, reads (and
+    caches resolutions on) the same view.
+    """
+    if views is None:
+        return SchemaView({"$ref": ref_path}, table)
+
+    return _shared_view(table, ref_path, (), views)
+
+
+def _shared_view(table: RefTable, ref_path: str, stack: Tuple[str, ...], views: dict) -> SchemaView:
+    # Only the enclosing components the target can reach change its
+    # expansion (where recursion is cut), so they are part of the key
+    reachable = table.reachable(ref_path)
+    cut = frozenset(ref for ref in stack if ref in reachable)
+
+    key = (ref_path, cut)
+    view = views.get(key)
+    if view is None:
+        view = views.setdefault(
+            key, SchemaView({"$ref": ref_path}, table, tuple(sorted(cut)), views)
+        )
+    return view
+
+
+class _PropertiesView(Mapping):
+    """
+    Lazily built `properties` mapping of a SchemaView.
+    """
+
+    __slots__ = ("_owner", "_properties", "_views")
+
+    def __init__(self, owner: SchemaView, properties: dict):
+        self._owner = owner
+        self._properties = properties
+        self._views = {}
+
+    def __getitem__(self, name: str):
+        view = self._views.get(name)
+        if view is None:
+            view = self._owner._child(self._properties[name])
+            self._views[name] = view
+        return view
+
+    def __contains__(self, name) -> bool:
+        return name in self._properties
+
+    def __iter__(self):
+        return iter(self._properties)
+
+    def __len__(self) -> int:
+        return len(self._properties)
+
+
+def _materialize(value):
+    if isinstance(value, Mapping):
+        return {key: _materialize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_materialize(item) for item in value]
+    return value
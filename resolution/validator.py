@@ -1,5 +1,6 @@
 # agent/resolution/validator.py
 
+from .constraints import violations
 from .context import StepResolutionContext
 
 
@@ -27,4 +28,16 @@ class SchemaValidator:
                         f"Invalid enum value for {field_name}: {value}"
                     )
 
+        # Constraint validation (lengths, pattern, bounds, formats, items)
+        errors = []
+
+        for field_name, schema in properties.items():
+            if field_name in context.resolved_body:
+                errors.extend(
+                    violations(context.resolved_body[field_name], schema, field_name)
+                )
+
+        if errors:
+            raise ValueError(f"Constraint violations: {'; '.join(errors)}")
+
         return context